@@ -6,16 +6,19 @@ CCD1HighLevel.py - CCD1高層API模組
 """
 
 import time
+import struct
 import threading
-from typing import Optional, Tuple, List, Dict, Any
-from collections import deque
+import asyncio
+import itertools
+from typing import Optional, Tuple, List, Dict, Any, Final
+from collections import deque, namedtuple
 from enum import IntEnum
 import logging
 from dataclasses import dataclass
 
 # 導入Modbus TCP Client (適配pymodbus 3.9.2)
 try:
-    from pymodbus.client import ModbusTcpClient
+    from pymodbus.client import ModbusTcpClient, AsyncModbusTcpClient
     from pymodbus.exceptions import ModbusException, ConnectionException
     MODBUS_AVAILABLE = True
 except ImportError as e:
@@ -23,6 +26,30 @@ except ImportError as e:
     MODBUS_AVAILABLE = False
 
 
+# ==================== 寄存器地址 (基地址200) ====================
+CONTROL_COMMAND_ADDR: Final[int] = 200     # 控制指令
+STATUS_ADDR: Final[int] = 201              # 狀態寄存器
+CIRCLE_COUNT_ADDR: Final[int] = 240        # 檢測圓形數量
+WORLD_COORD_VALID_ADDR: Final[int] = 256   # 世界座標有效標誌
+
+
+# ==================== 共用事件循環 ====================
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_event_loop_lock = threading.Lock()
+
+
+def _get_shared_event_loop() -> asyncio.AbstractEventLoop:
+    """取得所有CCD1HighLevelAPI實例共用的背景事件循環 (單一執行緒驅動多台CCD)"""
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None or _event_loop.is_closed():
+            _event_loop = asyncio.new_event_loop()
+            loop_thread = threading.Thread(target=_event_loop.run_forever,
+                                           name="CCD1AsyncLoop", daemon=True)
+            loop_thread.start()
+        return _event_loop
+
+
 # ==================== 控制指令枚舉 ====================
 class CCD1Command(IntEnum):
     """CCD1控制指令枚舉"""
@@ -41,6 +68,25 @@ class CCD1StatusBits(IntEnum):
     INITIALIZED = 3
 
 
+# 預先計算的狀態位遮罩
+READY_MASK: Final[int] = 1 << CCD1StatusBits.READY
+RUNNING_MASK: Final[int] = 1 << CCD1StatusBits.RUNNING
+ALARM_MASK: Final[int] = 1 << CCD1StatusBits.ALARM
+INITIALIZED_MASK: Final[int] = 1 << CCD1StatusBits.INITIALIZED
+
+
+# ==================== 系統狀態快照 ====================
+StatusSnapshot = namedtuple(
+    'StatusSnapshot',
+    'connected ready running alarm initialized world_coord_valid status_register_value error',
+    defaults=(None, None)
+)
+
+# 未連接/讀取失敗時的共用快照 (不可變，可重複返回)
+DISCONNECTED_STATUS = StatusSnapshot(False, False, False, False, False, False)
+READ_ERROR_STATUS = StatusSnapshot(True, False, False, True, False, False, error='無法讀取狀態寄存器')
+
+
 # ==================== 圓心座標數據結構 ====================
 @dataclass
 class CircleWorldCoord:
@@ -75,14 +121,16 @@ class CCD1HighLevelAPI:
         self.modbus_host = modbus_host
         self.modbus_port = modbus_port
         self.modbus_client: Optional[ModbusTcpClient] = None
+        self.async_client: Optional[AsyncModbusTcpClient] = None
+        self.event_loop: Optional[asyncio.AbstractEventLoop] = None
         self.connected = False
         
         # CCD1寄存器映射 (基地址200)
         self.REGISTERS = {
-            'CONTROL_COMMAND': 200,        # 控制指令
-            'STATUS_REGISTER': 201,        # 狀態寄存器
-            'CIRCLE_COUNT': 240,           # 檢測圓形數量
-            'WORLD_COORD_VALID': 256,      # 世界座標有效標誌
+            'CONTROL_COMMAND': CONTROL_COMMAND_ADDR,
+            'STATUS_REGISTER': STATUS_ADDR,
+            'CIRCLE_COUNT': CIRCLE_COUNT_ADDR,
+            'WORLD_COORD_VALID': WORLD_COORD_VALID_ADDR,
         }
         
         # 圓心座標FIFO佇列
@@ -92,6 +140,16 @@ class CCD1HighLevelAPI:
         # 狀態追蹤
         self.last_detection_count = 0
         self.operation_timeout = 10.0  # 操作超時時間(秒)
+        self.async_poll_interval = 0.005  # 非同步輪詢間隔(秒)
+        
+        # 連接健康檢查 (連續讀取失敗時以指數退避重連)
+        self._consecutive_errors = 0
+        self._reconnect_backoff = 1.0
+        self._reconnecting = False
+        # 連接鎖: connect/disconnect替換或關閉客戶端時持有；重連標誌亦在此鎖下測試與設置
+        self._conn_lock = threading.RLock()
+        self._user_disconnected = False  # 使用者主動斷開後背景重連不得恢復連接
+        self._disconnect_event = threading.Event()  # disconnect()時喚醒退避等待中的重連執行緒
         
         # 設置日誌
         self.logger = logging.getLogger("CCD1HighLevel")
@@ -107,6 +165,13 @@ class CCD1HighLevelAPI:
         Returns:
             bool: 連接是否成功
         """
+        with self._conn_lock:
+            self._user_disconnected = False
+            self._disconnect_event.clear()
+            return self._connect_locked()
+    
+    def _connect_locked(self) -> bool:
+        """建立同步與非同步連接 (呼叫端需持有_conn_lock)"""
         if not MODBUS_AVAILABLE:
             self.logger.error("Modbus Client不可用")
             return False
@@ -123,85 +188,254 @@ class CCD1HighLevelAPI:
                 timeout=3.0
             )
             
-            if self.modbus_client.connect():
-                self.connected = True
-                self.logger.info(f"Modbus TCP連接成功: {self.modbus_host}:{self.modbus_port}")
-                return True
-            else:
-                self.logger.error(f"Modbus TCP連接失敗: {self.modbus_host}:{self.modbus_port}")
+            # 同步連線供狀態查詢，非同步連線供握手流程 (capture_and_detect)；
+            # 兩者皆需成功才視為已連接，任一失敗時記錄具體原因
+            if not self.modbus_client.connect():
+                self.logger.error(f"Modbus TCP連接失敗 (同步連線): {self.modbus_host}:{self.modbus_port}")
+                self.connected = False
+                return False
+            
+            if not self._connect_async_client():
+                self.logger.error(f"Modbus TCP連接失敗 (非同步連線，握手流程不可用): "
+                                  f"{self.modbus_host}:{self.modbus_port}")
                 self.connected = False
                 return False
+            
+            self.connected = True
+            self.logger.info(f"Modbus TCP連接成功: {self.modbus_host}:{self.modbus_port}")
+            return True
                 
         except Exception as e:
             self.logger.error(f"Modbus TCP連接異常: {e}")
             self.connected = False
             return False
     
+    def _connect_async_client(self) -> bool:
+        """在共用事件循環上建立非同步Modbus連接"""
+        self.event_loop = _get_shared_event_loop()
+        future = asyncio.run_coroutine_threadsafe(self._connect_async(), self.event_loop)
+        return future.result(timeout=5.0)
+    
+    async def _connect_async(self) -> bool:
+        """建立AsyncModbusTcpClient並連接"""
+        if self.async_client:
+            self.async_client.close()
+        
+        self.async_client = AsyncModbusTcpClient(
+            host=self.modbus_host,
+            port=self.modbus_port,
+            timeout=3.0
+        )
+        return await self.async_client.connect()
+    
     def disconnect(self):
-        """斷開Modbus連接"""
-        if self.modbus_client and self.connected:
-            try:
-                self.modbus_client.close()
-                self.logger.info("Modbus TCP連接已斷開")
-            except:
-                pass
+        """斷開Modbus連接 (等待進行中的重連完成後再關閉，且之後不再自動重連)"""
+        with self._conn_lock:
+            self._user_disconnected = True
+            self._disconnect_event.set()
+            
+            if self.modbus_client and self.connected:
+                try:
+                    self.modbus_client.close()
+                    self.logger.info("Modbus TCP連接已斷開")
+                except:
+                    pass
+            
+            if self.async_client and self.event_loop:
+                try:
+                    self.event_loop.call_soon_threadsafe(self.async_client.close)
+                except:
+                    pass
+            
+            self.connected = False
+            self.modbus_client = None
+            self.async_client = None
+    
+    def _on_read_success(self):
+        """讀取成功，重置連接健康計數"""
+        self._consecutive_errors = 0
+        self._reconnect_backoff = 1.0
+    
+    def _on_read_failure(self):
+        """記錄讀取失敗，連續3次失敗後啟動背景重連執行緒 (退避與重試由執行緒負責)"""
+        self._consecutive_errors += 1
+        if self._consecutive_errors < 3 or self._reconnecting or self._user_disconnected:
+            return
+        
+        # 非阻塞取鎖：connect/disconnect進行中時本次不排程重連，讀取線程不因此等待
+        if not self._conn_lock.acquire(blocking=False):
+            return
+        try:
+            if self._reconnecting or self._user_disconnected:
+                return
+            self._reconnecting = True
+        finally:
+            self._conn_lock.release()
+        threading.Thread(target=self._reconnect_worker, daemon=True).start()
+    
+    def _reconnect_worker(self):
+        """背景重連執行緒 - 以指數退避(上限30秒)持續重試，直到連接成功或使用者主動斷開
         
-        self.connected = False
-        self.modbus_client = None
+        連接失敗後connected為False，呼叫端不再讀取，不能依賴後續讀取失敗觸發下一次重連；
+        每次嘗試全程持有_conn_lock，disconnect()會等待該次嘗試結束後再關閉
+        """
+        try:
+            self.logger.warning("連續 %d 次讀取失敗，嘗試重新連接", self._consecutive_errors)
+            retrying = False
+            while not self._user_disconnected:
+                with self._conn_lock:
+                    # 取得鎖前使用者可能已斷開；重試期間connected恢復為True表示已由connect()手動恢復
+                    if self._user_disconnected or (retrying and self.connected):
+                        return
+                    if self._connect_locked():
+                        self._consecutive_errors = 0
+                        self._reconnect_backoff = 1.0
+                        return
+                
+                self.logger.warning("重新連接失敗，%.0f秒後重試", self._reconnect_backoff)
+                if self._disconnect_event.wait(self._reconnect_backoff):
+                    return
+                self._reconnect_backoff = min(self._reconnect_backoff * 2, 30.0)
+                retrying = True
+        finally:
+            self._reconnecting = False
     
     def _read_register(self, register_name: str) -> Optional[int]:
-        """讀取寄存器"""
-        if not self.connected or not self.modbus_client or register_name not in self.REGISTERS:
+        """依名稱讀取寄存器"""
+        address = self.REGISTERS.get(register_name)
+        if address is None:
+            return None
+        return self._read_register_at(address)
+    
+    def _read_register_at(self, address: int) -> Optional[int]:
+        """依地址讀取寄存器"""
+        client = self.modbus_client  # 取用本地參考，connect/disconnect替換客戶端時不受影響
+        if not self.connected or not client or not client.is_socket_open():
+            # 連接已斷開時跳過注定失敗的讀取 (主動disconnect後modbus_client為None，不重連)
+            if client:
+                self._on_read_failure()
             return None
         
         try:
-            address = self.REGISTERS[register_name]
-            result = self.modbus_client.read_holding_registers(address, count=1, slave=1)
+            result = client.read_holding_registers(address, count=1, slave=1)
             
             if not result.isError():
+                self._on_read_success()
                 return result.registers[0]
             else:
                 return None
                 
         except Exception as e:
-            self.logger.error(f"讀取寄存器失敗: {e}")
+            self.logger.error("讀取寄存器失敗: %s", e)
+            self._on_read_failure()
             return None
     
     def _write_register(self, register_name: str, value: int) -> bool:
-        """寫入寄存器"""
-        if not self.connected or not self.modbus_client or register_name not in self.REGISTERS:
+        """依名稱寫入寄存器"""
+        address = self.REGISTERS.get(register_name)
+        if address is None:
+            return False
+        return self._write_register_at(address, value)
+    
+    def _write_register_at(self, address: int, value: int) -> bool:
+        """依地址寫入寄存器"""
+        client = self.modbus_client
+        if not self.connected or not client:
             return False
         
         try:
-            address = self.REGISTERS[register_name]
-            result = self.modbus_client.write_register(address, value, slave=1)
+            result = client.write_register(address, value, slave=1)
             
             return not result.isError()
                 
         except Exception as e:
-            self.logger.error(f"寫入寄存器失敗: {e}")
+            self.logger.error("寫入寄存器失敗: %s", e)
             return False
     
     def _read_multiple_registers(self, start_address: int, count: int) -> Optional[List[int]]:
         """讀取多個寄存器"""
-        if not self.connected or not self.modbus_client:
+        client = self.modbus_client
+        if not self.connected or not client or not client.is_socket_open():
+            if client:
+                self._on_read_failure()
+            return None
+        
+        try:
+            result = client.read_holding_registers(start_address, count=count, slave=1)
+            
+            if not result.isError():
+                self._on_read_success()
+                return result.registers
+            else:
+                return None
+                
+        except Exception as e:
+            self.logger.error("讀取多個寄存器失敗: %s", e)
+            self._on_read_failure()
+            return None
+    
+    async def _read_register_at_async(self, address: int) -> Optional[int]:
+        """依地址非同步讀取寄存器"""
+        client = self.async_client
+        if not self.connected or not client or not client.connected:
+            if client:
+                self._on_read_failure()
+            return None
+        
+        try:
+            result = await client.read_holding_registers(address, count=1, slave=1)
+            
+            if not result.isError():
+                self._on_read_success()
+                return result.registers[0]
+            else:
+                return None
+                
+        except Exception as e:
+            self.logger.error("非同步讀取寄存器失敗: %s", e)
+            self._on_read_failure()
+            return None
+    
+    async def _write_register_at_async(self, address: int, value: int) -> bool:
+        """依地址非同步寫入寄存器"""
+        client = self.async_client
+        if not self.connected or not client:
+            return False
+        
+        try:
+            result = await client.write_register(address, value, slave=1)
+            
+            return not result.isError()
+                
+        except Exception as e:
+            self.logger.error("非同步寫入寄存器失敗: %s", e)
+            return False
+    
+    async def _read_multiple_registers_async(self, start_address: int, count: int) -> Optional[List[int]]:
+        """非同步讀取多個寄存器"""
+        client = self.async_client
+        if not self.connected or not client or not client.connected:
+            if client:
+                self._on_read_failure()
             return None
         
         try:
-            result = self.modbus_client.read_holding_registers(start_address, count=count, slave=1)
+            result = await client.read_holding_registers(start_address, count=count, slave=1)
             
             if not result.isError():
+                self._on_read_success()
                 return result.registers
             else:
                 return None
                 
         except Exception as e:
-            self.logger.error(f"讀取多個寄存器失敗: {e}")
+            self.logger.error("非同步讀取多個寄存器失敗: %s", e)
+            self._on_read_failure()
             return None
     
-    def _wait_for_ready(self, timeout: float = 10.0) -> bool:
+    async def _wait_for_ready_async(self, timeout: float = 10.0) -> bool:
         """
-        等待CCD1系統Ready狀態
+        非同步等待CCD1系統Ready狀態
         
         Args:
             timeout: 超時時間(秒)
@@ -209,14 +443,15 @@ class CCD1HighLevelAPI:
         Returns:
             bool: 是否Ready
         """
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
         
-        while time.time() - start_time < timeout:
-            status = self._read_register('STATUS_REGISTER')
+        while loop.time() < deadline:
+            status = await self._read_register_at_async(STATUS_ADDR)
             if status is not None:
-                ready = bool(status & (1 << CCD1StatusBits.READY))
-                running = bool(status & (1 << CCD1StatusBits.RUNNING))
-                alarm = bool(status & (1 << CCD1StatusBits.ALARM))
+                ready = bool(status & READY_MASK)
+                running = bool(status & RUNNING_MASK)
+                alarm = bool(status & ALARM_MASK)
                 
                 if alarm:
                     self.logger.warning("CCD1系統處於Alarm狀態")
@@ -225,14 +460,14 @@ class CCD1HighLevelAPI:
                 if ready and not running:
                     return True
             
-            time.sleep(0.1)  # 100ms檢查間隔
+            await asyncio.sleep(self.async_poll_interval)
         
         self.logger.error(f"等待Ready狀態超時: {timeout}秒")
         return False
     
-    def _wait_for_command_complete(self, timeout: float = 10.0) -> bool:
+    async def _wait_for_command_complete_async(self, timeout: float = 10.0) -> bool:
         """
-        等待指令執行完成
+        非同步等待指令執行完成
         
         Args:
             timeout: 超時時間(秒)
@@ -240,13 +475,14 @@ class CCD1HighLevelAPI:
         Returns:
             bool: 指令是否執行完成
         """
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
         
-        while time.time() - start_time < timeout:
-            status = self._read_register('STATUS_REGISTER')
+        while loop.time() < deadline:
+            status = await self._read_register_at_async(STATUS_ADDR)
             if status is not None:
-                running = bool(status & (1 << CCD1StatusBits.RUNNING))
-                alarm = bool(status & (1 << CCD1StatusBits.ALARM))
+                running = bool(status & RUNNING_MASK)
+                alarm = bool(status & ALARM_MASK)
                 
                 if alarm:
                     self.logger.warning("CCD1系統執行中發生Alarm")
@@ -255,26 +491,26 @@ class CCD1HighLevelAPI:
                 if not running:
                     return True
             
-            time.sleep(0.1)  # 100ms檢查間隔
+            await asyncio.sleep(self.async_poll_interval)
         
         self.logger.error(f"等待指令完成超時: {timeout}秒")
         return False
     
-    def _read_world_coordinates(self) -> List[CircleWorldCoord]:
+    async def _read_world_coordinates_async(self) -> List[CircleWorldCoord]:
         """
-        讀取世界座標檢測結果
+        非同步讀取世界座標檢測結果
         
         Returns:
             List[CircleWorldCoord]: 圓心世界座標列表
         """
         # 檢查世界座標有效性
-        world_coord_valid = self._read_register('WORLD_COORD_VALID')
+        world_coord_valid = await self._read_register_at_async(WORLD_COORD_VALID_ADDR)
         if not world_coord_valid:
             self.logger.warning("世界座標無效，可能缺少標定數據")
             return []
         
         # 讀取檢測到的圓形數量
-        circle_count = self._read_register('CIRCLE_COUNT')
+        circle_count = await self._read_register_at_async(CIRCLE_COUNT_ADDR)
         if not circle_count or circle_count == 0:
             self.logger.info("未檢測到圓形")
             return []
@@ -282,12 +518,26 @@ class CCD1HighLevelAPI:
         # 限制最多5個圓形
         circle_count = min(circle_count, 5)
         
-        # 讀取像素座標結果 (240-255)
-        pixel_registers = self._read_multiple_registers(241, 15)  # 241-255
+        # 讀取像素座標結果 (241-255) 與世界座標結果 (257-276)
+        pixel_registers = await self._read_multiple_registers_async(241, 15)
+        world_registers = await self._read_multiple_registers_async(257, 20)
         
-        # 讀取世界座標結果 (257-276)
-        world_registers = self._read_multiple_registers(257, 20)  # 257-276
+        return self._parse_world_coordinates(circle_count, pixel_registers, world_registers)
+    
+    def _parse_world_coordinates(self, circle_count: int,
+                                 pixel_registers: Optional[List[int]],
+                                 world_registers: Optional[List[int]]) -> List[CircleWorldCoord]:
+        """
+        解析檢測結果寄存器為圓心世界座標
         
+        Args:
+            circle_count: 圓形數量 (已限制最多5個)
+            pixel_registers: 像素座標寄存器 (241-255)
+            world_registers: 世界座標寄存器 (257-276)
+            
+        Returns:
+            List[CircleWorldCoord]: 圓心世界座標列表
+        """
         if not pixel_registers or not world_registers:
             self.logger.error("讀取檢測結果失敗")
             return []
@@ -295,6 +545,12 @@ class CCD1HighLevelAPI:
         coordinates = []
         current_time = time.strftime("%Y-%m-%d %H:%M:%S")
         
+        # 世界座標 (每個圓形4個寄存器: X高位, X低位, Y高位, Y低位)
+        # 以struct一次完成32位合併與有符號轉換
+        world_word_count = len(world_registers) & ~1
+        world_buffer = struct.pack(f'>{world_word_count}H', *world_registers[:world_word_count])
+        world_ints = struct.unpack(f'>{world_word_count // 2}i', world_buffer)
+        
         for i in range(circle_count):
             # 像素座標 (每個圓形3個寄存器: X, Y, Radius)
             pixel_start_idx = i * 3
@@ -305,27 +561,11 @@ class CCD1HighLevelAPI:
             else:
                 continue
             
-            # 世界座標 (每個圓形4個寄存器: X高位, X低位, Y高位, Y低位)
-            world_start_idx = i * 4
-            if world_start_idx + 3 < len(world_registers):
-                world_x_high = world_registers[world_start_idx]
-                world_x_low = world_registers[world_start_idx + 1]
-                world_y_high = world_registers[world_start_idx + 2]
-                world_y_low = world_registers[world_start_idx + 3]
-                
-                # 32位合併並轉換精度
-                world_x_int = (world_x_high << 16) | world_x_low
-                world_y_int = (world_y_high << 16) | world_y_low
-                
-                # 處理負數 (32位有符號整數)
-                if world_x_int >= 2147483648:
-                    world_x_int -= 4294967296
-                if world_y_int >= 2147483648:
-                    world_y_int -= 4294967296
-                
+            world_start_idx = i * 2
+            if world_start_idx + 1 < len(world_ints):
                 # 恢復精度 (÷100)
-                world_x = world_x_int / 100.0
-                world_y = world_y_int / 100.0
+                world_x = world_ints[world_start_idx] / 100.0
+                world_y = world_ints[world_start_idx + 1] / 100.0
             else:
                 continue
             
@@ -346,6 +586,28 @@ class CCD1HighLevelAPI:
         """
         執行拍照+檢測指令
         
+        同步包裝: 將capture_and_detect_async提交至共用背景事件循環並等待結果
+        
+        Returns:
+            bool: 操作是否成功
+        """
+        if not self.connected or not self.event_loop:
+            self.logger.error("Modbus未連接")
+            return False
+        
+        future = asyncio.run_coroutine_threadsafe(self.capture_and_detect_async(), self.event_loop)
+        try:
+            # 兩段等待各自有超時，此處僅作為保險
+            return future.result(timeout=self.operation_timeout * 2 + 5.0)
+        except Exception as e:
+            future.cancel()
+            self.logger.error("拍照檢測執行異常: %s", e)
+            return False
+    
+    async def capture_and_detect_async(self) -> bool:
+        """
+        非同步執行拍照+檢測指令
+        
         本方法處理完整的握手協議，包括:
         1. 檢查Ready狀態
         2. 發送拍照+檢測指令 (16)
@@ -361,23 +623,23 @@ class CCD1HighLevelAPI:
         
         try:
             # 1. 等待Ready狀態
-            if not self._wait_for_ready(self.operation_timeout):
+            if not await self._wait_for_ready_async(self.operation_timeout):
                 self.logger.error("系統未Ready，無法執行檢測")
                 return False
             
             # 2. 發送拍照+檢測指令
             self.logger.info("發送拍照+檢測指令...")
-            if not self._write_register('CONTROL_COMMAND', CCD1Command.CAPTURE_DETECT):
+            if not await self._write_register_at_async(CONTROL_COMMAND_ADDR, CCD1Command.CAPTURE_DETECT):
                 self.logger.error("發送檢測指令失敗")
                 return False
             
             # 3. 等待執行完成
-            if not self._wait_for_command_complete(self.operation_timeout):
+            if not await self._wait_for_command_complete_async(self.operation_timeout):
                 self.logger.error("檢測指令執行失敗或超時")
                 return False
             
             # 4. 讀取檢測結果
-            coordinates = self._read_world_coordinates()
+            coordinates = await self._read_world_coordinates_async()
             
             # 5. 更新FIFO佇列
             with self.queue_lock:
@@ -387,13 +649,13 @@ class CCD1HighLevelAPI:
                 self.last_detection_count = len(coordinates)
             
             # 6. 清空控制指令 (完成握手)
-            self._write_register('CONTROL_COMMAND', CCD1Command.CLEAR)
+            await self._write_register_at_async(CONTROL_COMMAND_ADDR, CCD1Command.CLEAR)
             
-            self.logger.info(f"檢測完成，新增 {len(coordinates)} 個圓心座標到佇列")
+            self.logger.info("檢測完成，新增 %d 個圓心座標到佇列", len(coordinates))
             return True
             
         except Exception as e:
-            self.logger.error(f"拍照檢測執行異常: {e}")
+            self.logger.error("拍照檢測執行異常: %s", e)
             return False
     
     def get_next_circle_world_coord(self) -> Optional[CircleWorldCoord]:
@@ -411,7 +673,7 @@ class CCD1HighLevelAPI:
         with self.queue_lock:
             # 檢查佇列是否為空
             if len(self.coord_queue) == 0:
-                self.logger.info("佇列為空，觸發新的拍照+檢測...")
+                self.logger.debug("佇列為空，觸發新的拍照+檢測...")
                 
                 # 釋放鎖，執行檢測操作
                 with_lock_released = True
@@ -427,7 +689,8 @@ class CCD1HighLevelAPI:
         with self.queue_lock:
             if len(self.coord_queue) > 0:
                 coord = self.coord_queue.popleft()  # FIFO: 從前端取出
-                self.logger.info(f"返回圓心座標: ID={coord.id}, 世界座標=({coord.world_x:.2f}, {coord.world_y:.2f})mm")
+                self.logger.debug("返回圓心座標: ID=%d, 世界座標=(%.2f, %.2f)mm",
+                                  coord.id, coord.world_x, coord.world_y)
                 return coord
             else:
                 self.logger.warning("佇列仍為空，無可用座標")
@@ -440,18 +703,18 @@ class CCD1HighLevelAPI:
         Returns:
             Dict: 包含佇列長度、最後檢測數量等資訊
         """
+        # 鎖內僅擷取前3個座標快照，縮短臨界區
         with self.queue_lock:
             queue_length = len(self.coord_queue)
-            queue_preview = []
-            
-            # 獲取前3個座標的預覽
-            for i, coord in enumerate(list(self.coord_queue)[:3]):
-                queue_preview.append({
-                    'id': coord.id,
-                    'world_x': coord.world_x,
-                    'world_y': coord.world_y,
-                    'timestamp': coord.timestamp
-                })
+            snapshot = list(itertools.islice(self.coord_queue, 3))
+        
+        # 鎖外建立預覽
+        queue_preview = [{
+            'id': coord.id,
+            'world_x': coord.world_x,
+            'world_y': coord.world_y,
+            'timestamp': coord.timestamp
+        } for coord in snapshot]
         
         return {
             'connected': self.connected,
@@ -477,54 +740,37 @@ class CCD1HighLevelAPI:
         if not self.connected:
             return False
         
-        status = self._read_register('STATUS_REGISTER')
+        status = self._read_register_at(STATUS_ADDR)
         if status is not None:
-            ready = bool(status & (1 << CCD1StatusBits.READY))
-            alarm = bool(status & (1 << CCD1StatusBits.ALARM))
-            return ready and not alarm
+            return bool(status & READY_MASK) and not status & ALARM_MASK
         
         return False
     
-    def get_system_status(self) -> Dict[str, Any]:
+    def get_system_status(self) -> StatusSnapshot:
         """
         獲取CCD1系統狀態
         
         Returns:
-            Dict: 系統狀態資訊
+            StatusSnapshot: 系統狀態快照 (需要字典時可呼叫 _asdict())
         """
         if not self.connected:
-            return {
-                'connected': False,
-                'ready': False,
-                'running': False,
-                'alarm': False,
-                'initialized': False,
-                'world_coord_valid': False
-            }
-        
-        status = self._read_register('STATUS_REGISTER')
-        world_coord_valid = self._read_register('WORLD_COORD_VALID')
-        
-        if status is not None:
-            return {
-                'connected': True,
-                'ready': bool(status & (1 << CCD1StatusBits.READY)),
-                'running': bool(status & (1 << CCD1StatusBits.RUNNING)),
-                'alarm': bool(status & (1 << CCD1StatusBits.ALARM)),
-                'initialized': bool(status & (1 << CCD1StatusBits.INITIALIZED)),
-                'world_coord_valid': bool(world_coord_valid) if world_coord_valid is not None else False,
-                'status_register_value': status
-            }
-        
-        return {
-            'connected': True,
-            'ready': False,
-            'running': False,
-            'alarm': True,
-            'initialized': False,
-            'world_coord_valid': False,
-            'error': '無法讀取狀態寄存器'
-        }
+            return DISCONNECTED_STATUS
+        
+        # 一次讀取狀態寄存器(201)至世界座標有效標誌(256)
+        registers = self._read_multiple_registers(STATUS_ADDR, WORLD_COORD_VALID_ADDR - STATUS_ADDR + 1)
+        if not registers:
+            return READ_ERROR_STATUS
+        
+        status = registers[0]
+        return StatusSnapshot(
+            connected=True,
+            ready=bool(status & READY_MASK),
+            running=bool(status & RUNNING_MASK),
+            alarm=bool(status & ALARM_MASK),
+            initialized=bool(status & INITIALIZED_MASK),
+            world_coord_valid=bool(registers[-1]),
+            status_register_value=status
+        )
 
 
 # ==================== 使用範例 ====================
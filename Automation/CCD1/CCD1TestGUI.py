@@ -5,8 +5,12 @@ CCD1TestGUI.py - CCD1高層API測試工具
 """
 
 import customtkinter as ctk
+import tkinter as tk
 import threading
+import asyncio
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from datetime import datetime
 import tkinter.messagebox as messagebox
@@ -23,6 +27,11 @@ except ImportError as e:
 class CCD1TestGUI:
     """CCD1高層API測試GUI"""
     
+    MAX_LINES = 1000  # 日誌列表保留的最大行數
+    
+    # 日誌等級顏色 (依訊息開頭的符號判斷)
+    LOG_COLORS = {"❌": "red", "⚠️": "darkorange", "✅": "green"}
+    
     def __init__(self):
         # 設置主題
         ctk.set_appearance_mode("light")
@@ -36,17 +45,45 @@ class CCD1TestGUI:
         
         # CCD1 API實例
         self.ccd1: Optional[CCD1HighLevelAPI] = None
-        self.connected = False
         
-        # 狀態更新線程控制
-        self.status_thread_running = False
-        self.status_thread = None
+        # 狀態輪詢 (after()定時觸發，阻塞讀取交由單一工作線程執行)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._poll_job = None
+        self._ui_connected = False  # 連接UI目前顯示的狀態，輪詢發現連線變化時據此切換
+        self._stop_evt = threading.Event()  # 關閉視窗時設定，停止回傳UI更新
+        
+        # 操作事件循環 (單一背景線程協調連接/檢測/取座標/斷開，阻塞呼叫交由_executor)
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self._job_slots = threading.BoundedSemaphore(8)  # 最多8個待執行操作
+        
+        # 狀態快取 (200ms內的重複查詢共用同一次讀取)
+        self._status_cache = {'ts': 0.0, 'sys': None, 'q': None}
+        self._status_cache_lock = threading.Lock()
+        
+        # 最後套用到UI的狀態 (狀態未變時跳過label更新)
+        self._last_status = {}
+        self._label_colors = {}
+        
+        # 日誌緩衝 (各線程寫入，UI線程每100ms批次刷新)
+        self._log_buf = deque()
+        self._log_lock = threading.Lock()
+        self._log_flush_job = None
         
         # 創建UI
         self.setup_ui()
         
-        # 自動嘗試連接
-        self.connect_ccd1()
+        # 啟動日誌批次刷新
+        self._log_flush_job = self.root.after(100, self._flush_log)
+        
+        # 自動嘗試連接 (待主循環空閒後執行，確保after回調在mainloop啟動後觸發)
+        self.root.after_idle(self.connect_ccd1)
+    
+    @property
+    def connected(self) -> bool:
+        """CCD1是否已連接 (直接讀取API實例狀態)"""
+        ccd1 = self.ccd1
+        return ccd1 is not None and ccd1.connected
     
     def setup_ui(self):
         """創建用戶介面"""
@@ -144,6 +181,16 @@ class CCD1TestGUI:
         )
         self.get_coord_btn.pack(side="left", padx=10, pady=10)
         
+        # 取出全部座標按鈕
+        self.drain_coords_btn = ctk.CTkButton(
+            btn_container,
+            text="取出全部座標",
+            command=self.drain_all_coordinates,
+            width=120,
+            height=40
+        )
+        self.drain_coords_btn.pack(side="left", padx=10, pady=10)
+        
         # 清空佇列按鈕
         self.clear_queue_btn = ctk.CTkButton(
             btn_container,
@@ -181,30 +228,43 @@ class CCD1TestGUI:
         fifo_title.pack(pady=5)
         
         # 佇列狀態標籤
+        self.queue_status_var = ctk.StringVar(value="佇列長度: 0 | 最後檢測: 0個")
         self.queue_status_label = ctk.CTkLabel(
             fifo_frame, 
-            text="佇列長度: 0 | 最後檢測: 0個", 
+            textvariable=self.queue_status_var, 
             font=ctk.CTkFont(size=12)
         )
         self.queue_status_label.pack(pady=5)
         
-        # 檢測結果文本框
-        self.result_text = ctk.CTkTextbox(
-            fifo_frame,
-            width=750,
-            height=250,
-            font=ctk.CTkFont(family="Consolas", size=12)
+        # 檢測結果列表 (每行一列，只繪製可見列)
+        result_container = ctk.CTkFrame(fifo_frame)
+        result_container.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        self.result_listbox = tk.Listbox(
+            result_container,
+            height=15,
+            font=("Consolas", 12),
+            activestyle="none",
+            borderwidth=0,
+            highlightthickness=0
         )
-        self.result_text.pack(fill="both", expand=True, padx=10, pady=10)
+        result_scrollbar = ctk.CTkScrollbar(result_container, command=self.result_listbox.yview)
+        self.result_listbox.configure(yscrollcommand=result_scrollbar.set)
+        result_scrollbar.pack(side="right", fill="y")
+        self.result_listbox.pack(side="left", fill="both", expand=True)
         
         # 初始提示
-        self.result_text.insert("1.0", "=== CCD1高層API測試工具 ===\n")
-        self.result_text.insert("end", "點擊上方按鈕開始測試...\n\n")
-        self.result_text.insert("end", "操作說明:\n")
-        self.result_text.insert("end", "1. 執行拍照+檢測: 觸發CCD1檢測，結果自動加入FIFO佇列\n")
-        self.result_text.insert("end", "2. 獲取下一個圓心座標: 從FIFO佇列取出一個座標（佇列空時自動檢測）\n")
-        self.result_text.insert("end", "3. 清空FIFO佇列: 清空所有待處理的圓心座標\n")
-        self.result_text.insert("end", "4. 刷新狀態: 更新連接和佇列狀態資訊\n\n")
+        self.result_listbox.insert(tk.END, *[
+            "=== CCD1高層API測試工具 ===",
+            "點擊上方按鈕開始測試...",
+            "",
+            "操作說明:",
+            "1. 執行拍照+檢測: 觸發CCD1檢測，結果自動加入FIFO佇列",
+            "2. 獲取下一個圓心座標: 從FIFO佇列取出一個座標（佇列空時自動檢測）",
+            "3. 清空FIFO佇列: 清空所有待處理的圓心座標",
+            "4. 刷新狀態: 更新連接和佇列狀態資訊",
+            "",
+        ])
     
     def create_status_frame(self, parent):
         """創建系統狀態框架"""
@@ -223,33 +283,37 @@ class CCD1TestGUI:
         status_container.pack(fill="x", padx=10, pady=5)
         
         # Ready狀態
+        self.ready_var = ctk.StringVar(value="Ready: ❌")
         self.ready_label = ctk.CTkLabel(
             status_container, 
-            text="Ready: ❌", 
+            textvariable=self.ready_var, 
             font=ctk.CTkFont(size=12)
         )
         self.ready_label.pack(side="left", padx=10, pady=5)
         
         # Running狀態
+        self.running_var = ctk.StringVar(value="Running: ❌")
         self.running_label = ctk.CTkLabel(
             status_container, 
-            text="Running: ❌", 
+            textvariable=self.running_var, 
             font=ctk.CTkFont(size=12)
         )
         self.running_label.pack(side="left", padx=10, pady=5)
         
         # Alarm狀態
+        self.alarm_var = ctk.StringVar(value="Alarm: ❌")
         self.alarm_label = ctk.CTkLabel(
             status_container, 
-            text="Alarm: ❌", 
+            textvariable=self.alarm_var, 
             font=ctk.CTkFont(size=12)
         )
         self.alarm_label.pack(side="left", padx=10, pady=5)
         
         # 世界座標狀態
+        self.world_coord_var = ctk.StringVar(value="世界座標: ❌")
         self.world_coord_label = ctk.CTkLabel(
             status_container, 
-            text="世界座標: ❌", 
+            textvariable=self.world_coord_var, 
             font=ctk.CTkFont(size=12)
         )
         self.world_coord_label.pack(side="left", padx=10, pady=5)
@@ -263,18 +327,20 @@ class CCD1TestGUI:
         
         self.log_message("🔗 正在連接CCD1...")
         
-        def connect_thread():
+        async def connect_job():
             try:
-                self.ccd1 = CCD1HighLevelAPI()
+                # 舊實例可能仍在背景重連，先斷開使其停止
+                if self.ccd1:
+                    await self._run_blocking(self.ccd1.disconnect)
+                self.ccd1 = await self._run_blocking(CCD1HighLevelAPI)
                 if self.ccd1.connected:
-                    self.connected = True
                     self.log_message("✅ CCD1連接成功")
                     
                     # 更新UI狀態
                     self.root.after(0, self.update_connection_ui, True)
                     
-                    # 啟動狀態監控線程
-                    self.start_status_thread()
+                    # 啟動狀態輪詢
+                    self.root.after(0, self.start_status_poll)
                 else:
                     self.log_message("❌ CCD1連接失敗")
                     self.root.after(0, self.update_connection_ui, False)
@@ -283,21 +349,27 @@ class CCD1TestGUI:
                 self.log_message(f"❌ CCD1連接異常: {e}")
                 self.root.after(0, self.update_connection_ui, False)
         
-        threading.Thread(target=connect_thread, daemon=True).start()
+        if self._submit_work(connect_job):
+            self.connect_btn.configure(state="disabled")
     
     def disconnect_ccd1(self):
         """斷開CCD1連接"""
-        if self.ccd1:
-            self.stop_status_thread()
-            self.ccd1.disconnect()
-            self.ccd1 = None
+        self.stop_status_poll()
         
-        self.connected = False
-        self.update_connection_ui(False)
-        self.log_message("🔌 CCD1連接已斷開")
+        async def disconnect_job():
+            if self.ccd1:
+                await self._run_blocking(self.ccd1.disconnect)
+                self.ccd1 = None
+            
+            self.root.after(0, self.update_connection_ui, False)
+            self.log_message("🔌 CCD1連接已斷開")
+        
+        if self._submit_work(disconnect_job):
+            self.disconnect_btn.configure(state="disabled")
     
     def update_connection_ui(self, connected: bool):
         """更新連接狀態UI"""
+        self._ui_connected = connected
         if connected:
             self.conn_status_label.configure(text="連接狀態: 已連接", text_color="green")
             self.connect_btn.configure(state="disabled")
@@ -306,6 +378,7 @@ class CCD1TestGUI:
             # 啟用控制按鈕
             self.detect_btn.configure(state="normal")
             self.get_coord_btn.configure(state="normal")
+            self.drain_coords_btn.configure(state="normal")
             self.clear_queue_btn.configure(state="normal")
         else:
             self.conn_status_label.configure(text="連接狀態: 未連接", text_color="red")
@@ -315,70 +388,158 @@ class CCD1TestGUI:
             # 禁用控制按鈕
             self.detect_btn.configure(state="disabled")
             self.get_coord_btn.configure(state="disabled")
+            self.drain_coords_btn.configure(state="disabled")
             self.clear_queue_btn.configure(state="disabled")
     
     def execute_detection(self):
         """執行拍照+檢測"""
-        if not self.connected or not self.ccd1:
+        if not self.connected:
             self.log_message("❌ CCD1未連接")
             return
         
         self.log_message("📸 執行拍照+檢測...")
         
-        def detection_thread():
+        async def detection_job():
             try:
-                success = self.ccd1.capture_and_detect()
+                success = await self._run_blocking(self.ccd1.capture_and_detect)
                 if success:
-                    queue_status = self.ccd1.get_queue_status()
+                    self._invalidate_status_cache()
+                    _, queue_status = await self._run_blocking(self._cached_status)
                     self.root.after(0, self.log_message, 
                                   f"✅ 檢測完成! 新增 {queue_status['last_detection_count']} 個圓心到佇列")
-                    self.root.after(0, self.update_queue_status)
+                    self.root.after(0, self.update_queue_status, queue_status)
                 else:
                     self.root.after(0, self.log_message, "❌ 檢測失敗")
             except Exception as e:
                 self.root.after(0, self.log_message, f"❌ 檢測異常: {e}")
         
-        threading.Thread(target=detection_thread, daemon=True).start()
+        self._submit_work(detection_job, self.detect_btn)
     
     def get_next_coordinate(self):
         """獲取下一個圓心座標"""
-        if not self.connected or not self.ccd1:
+        if not self.connected:
             self.log_message("❌ CCD1未連接")
             return
         
         self.log_message("🎯 獲取下一個圓心座標...")
         
-        def get_coord_thread():
+        async def get_coord_job():
             try:
-                coord = self.ccd1.get_next_circle_world_coord()
+                coord = await self._run_blocking(self.ccd1.get_next_circle_world_coord)
+                self._invalidate_status_cache()
                 if coord:
+                    _, queue_status = await self._run_blocking(self._cached_status)
                     self.root.after(0, self.display_coordinate, coord)
-                    self.root.after(0, self.update_queue_status)
+                    self.root.after(0, self.update_queue_status, queue_status)
                 else:
                     self.root.after(0, self.log_message, "⚠️ 佇列為空，無可用座標")
             except Exception as e:
                 self.root.after(0, self.log_message, f"❌ 獲取座標異常: {e}")
         
-        threading.Thread(target=get_coord_thread, daemon=True).start()
+        self._submit_work(get_coord_job, self.get_coord_btn)
     
-    def display_coordinate(self, coord: CircleWorldCoord):
-        """顯示圓心座標"""
-        coord_info = (
+    async def _run_blocking(self, fn, *args):
+        """在單一工作線程執行阻塞呼叫 (與狀態輪詢共用，確保CCD1呼叫不並行)"""
+        return await self._loop.run_in_executor(self._executor, fn, *args)
+    
+    async def _run_job(self, coro_fn, btn):
+        """執行操作協程，完成後釋放佇列名額並重新啟用按鈕"""
+        try:
+            await coro_fn()
+        except Exception as e:
+            print(f"操作執行異常: {e}")
+        finally:
+            self._job_slots.release()
+            if btn is not None and not self._stop_evt.is_set():
+                self.root.after(0, self._reenable_btn, btn)
+    
+    def _submit_work(self, coro_fn, btn=None) -> bool:
+        """
+        提交操作協程到事件循環
+        
+        Args:
+            coro_fn: 要執行的協程函數
+            btn: 觸發的按鈕，執行期間禁用，完成後重新啟用
+            
+        Returns:
+            bool: 是否成功提交
+        """
+        if not self._job_slots.acquire(blocking=False):
+            self.log_message("⚠️ 忙碌中，請稍後再試")
+            return False
+        
+        asyncio.run_coroutine_threadsafe(self._run_job(coro_fn, btn), self._loop)
+        
+        if btn is not None:
+            btn.configure(state="disabled")
+        return True
+    
+    def _reenable_btn(self, btn):
+        """操作完成後重新啟用按鈕 (僅在仍連接時)"""
+        if self.connected:
+            btn.configure(state="normal")
+    
+    def drain_all_coordinates(self):
+        """取出佇列中全部圓心座標 (不觸發新檢測)"""
+        if not self.connected:
+            self.log_message("❌ CCD1未連接")
+            return
+        
+        self.log_message("📤 取出全部圓心座標...")
+        
+        def drain_queue():
+            # 以目前佇列長度為上限，避免佇列取空後自動觸發新檢測
+            pending = self.ccd1.get_queue_status()['queue_length']
+            coords = []
+            for _ in range(pending):
+                coord = self.ccd1.get_next_circle_world_coord()
+                if not coord:
+                    break
+                coords.append(coord)
+            return coords
+        
+        async def drain_job():
+            try:
+                coords = await self._run_blocking(drain_queue)
+                self._invalidate_status_cache()
+                if coords:
+                    _, queue_status = await self._run_blocking(self._cached_status)
+                    self.root.after(0, self.drain_and_log_coords, coords)
+                    self.root.after(0, self.update_queue_status, queue_status)
+                else:
+                    self.root.after(0, self.log_message, "⚠️ 佇列為空，無可用座標")
+            except Exception as e:
+                self.root.after(0, self.log_message, f"❌ 取出座標異常: {e}")
+        
+        self._submit_work(drain_job, self.drain_coords_btn)
+    
+    def format_coordinate(self, coord: CircleWorldCoord) -> str:
+        """格式化圓心座標顯示字串"""
+        return (
             f"🔵 圓心座標 #{coord.id} | {coord.timestamp}\n"
             f"   世界座標: ({coord.world_x:.2f}, {coord.world_y:.2f}) mm\n"
             f"   像素座標: ({coord.pixel_x}, {coord.pixel_y}) px\n"
             f"   半徑: {coord.radius} px\n"
         )
-        self.log_message(coord_info)
+    
+    def display_coordinate(self, coord: CircleWorldCoord):
+        """顯示圓心座標"""
+        self.log_message(self.format_coordinate(coord))
+    
+    def drain_and_log_coords(self, coords_list):
+        """將多個圓心座標合併為一則訊息記錄"""
+        self.log_message(f"共取出 {len(coords_list)} 個圓心座標\n"
+                         + "".join(self.format_coordinate(coord) for coord in coords_list))
     
     def clear_queue(self):
         """清空FIFO佇列"""
-        if not self.connected or not self.ccd1:
+        if not self.connected:
             self.log_message("❌ CCD1未連接")
             return
         
         try:
             self.ccd1.clear_queue()
+            self._invalidate_status_cache()
             self.log_message("🗑️ FIFO佇列已清空")
             self.update_queue_status()
         except Exception as e:
@@ -386,120 +547,222 @@ class CCD1TestGUI:
     
     def refresh_status(self):
         """刷新狀態"""
-        if not self.connected or not self.ccd1:
+        if not self.connected:
             self.log_message("❌ CCD1未連接")
             return
         
         try:
-            system_status = self.ccd1.get_system_status()
-            queue_status = self.ccd1.get_queue_status()
+            system_status, queue_status = self._cached_status()
             
             self.log_message("🔄 狀態已刷新")
-            self.update_queue_status()
+            self.update_queue_status(queue_status)
             self.update_system_status(system_status)
             
         except Exception as e:
             self.log_message(f"❌ 刷新狀態異常: {e}")
     
-    def update_queue_status(self):
+    def update_queue_status(self, queue_status: dict = None):
         """更新佇列狀態"""
-        if not self.connected or not self.ccd1:
+        if not self.connected:
             return
         
         try:
-            queue_status = self.ccd1.get_queue_status()
-            self.queue_status_label.configure(
-                text=f"佇列長度: {queue_status['queue_length']} | "
-                     f"最後檢測: {queue_status['last_detection_count']}個"
-            )
+            if queue_status is None:
+                _, queue_status = self._cached_status()
+            
+            key = (queue_status['queue_length'], queue_status['last_detection_count'])
+            if key == self._last_status.get('queue'):
+                return
+            self._last_status['queue'] = key
+            
+            self.queue_status_var.set(f"佇列長度: {key[0]} | 最後檢測: {key[1]}個")
         except Exception as e:
             print(f"更新佇列狀態異常: {e}")
     
-    def update_system_status(self, status: dict = None):
+    def update_system_status(self, status=None):
         """更新系統狀態"""
-        if not self.connected or not self.ccd1:
+        if not self.connected:
+            if self._last_status.get('sys') == 'reset':
+                return
+            self._last_status['sys'] = 'reset'
+            
             # 重置狀態顯示
-            self.ready_label.configure(text="Ready: ❌", text_color="red")
-            self.running_label.configure(text="Running: ❌", text_color="red")
-            self.alarm_label.configure(text="Alarm: ❌", text_color="red")
-            self.world_coord_label.configure(text="世界座標: ❌", text_color="red")
+            self._set_status_label(self.ready_label, self.ready_var, "Ready: ❌", "red")
+            self._set_status_label(self.running_label, self.running_var, "Running: ❌", "red")
+            self._set_status_label(self.alarm_label, self.alarm_var, "Alarm: ❌", "red")
+            self._set_status_label(self.world_coord_label, self.world_coord_var, "世界座標: ❌", "red")
             return
         
         try:
             if status is None:
-                status = self.ccd1.get_system_status()
+                status, _ = self._cached_status()
+            
+            key = (status.ready, status.running, status.alarm, status.world_coord_valid)
+            if key == self._last_status.get('sys'):
+                return
+            self._last_status['sys'] = key
             
             # 更新Ready狀態
-            if status.get('ready', False):
-                self.ready_label.configure(text="Ready: ✅", text_color="green")
+            if status.ready:
+                self._set_status_label(self.ready_label, self.ready_var, "Ready: ✅", "green")
             else:
-                self.ready_label.configure(text="Ready: ❌", text_color="red")
+                self._set_status_label(self.ready_label, self.ready_var, "Ready: ❌", "red")
             
             # 更新Running狀態
-            if status.get('running', False):
-                self.running_label.configure(text="Running: ✅", text_color="orange")
+            if status.running:
+                self._set_status_label(self.running_label, self.running_var, "Running: ✅", "orange")
             else:
-                self.running_label.configure(text="Running: ❌", text_color="gray")
+                self._set_status_label(self.running_label, self.running_var, "Running: ❌", "gray")
             
             # 更新Alarm狀態
-            if status.get('alarm', False):
-                self.alarm_label.configure(text="Alarm: ⚠️", text_color="red")
+            if status.alarm:
+                self._set_status_label(self.alarm_label, self.alarm_var, "Alarm: ⚠️", "red")
             else:
-                self.alarm_label.configure(text="Alarm: ✅", text_color="green")
+                self._set_status_label(self.alarm_label, self.alarm_var, "Alarm: ✅", "green")
             
             # 更新世界座標狀態
-            if status.get('world_coord_valid', False):
-                self.world_coord_label.configure(text="世界座標: ✅", text_color="green")
+            if status.world_coord_valid:
+                self._set_status_label(self.world_coord_label, self.world_coord_var, "世界座標: ✅", "green")
             else:
-                self.world_coord_label.configure(text="世界座標: ❌", text_color="orange")
+                self._set_status_label(self.world_coord_label, self.world_coord_var, "世界座標: ❌", "orange")
                 
         except Exception as e:
             print(f"更新系統狀態異常: {e}")
     
-    def start_status_thread(self):
-        """啟動狀態監控線程"""
-        if self.status_thread_running:
+    def _set_status_label(self, label, var, text: str, color: str):
+        """更新狀態標籤文字，顏色僅在改變時重新設定"""
+        var.set(text)
+        if self._label_colors.get(label) != color:
+            self._label_colors[label] = color
+            label.configure(text_color=color)
+    
+    def _cached_status(self):
+        """
+        獲取 (系統狀態, 佇列狀態)，200ms內的重複呼叫直接返回快取
+        
+        Returns:
+            tuple: (system_status, queue_status)
+        """
+        with self._status_cache_lock:
+            cache = self._status_cache
+            if cache['sys'] is not None and time.monotonic() - cache['ts'] < 0.2:
+                return cache['sys'], cache['q']
+            
+            ccd1 = self.ccd1
+            cache['sys'] = ccd1.get_system_status()
+            cache['q'] = ccd1.get_queue_status()
+            cache['ts'] = time.monotonic()
+            return cache['sys'], cache['q']
+    
+    def _invalidate_status_cache(self):
+        """佇列或系統狀態變動後使快取失效"""
+        with self._status_cache_lock:
+            self._status_cache['sys'] = None
+    
+    def start_status_poll(self):
+        """啟動狀態輪詢"""
+        if self._poll_job is None:
+            self._poll_status()
+    
+    def stop_status_poll(self):
+        """停止狀態輪詢"""
+        if self._poll_job is not None:
+            self.root.after_cancel(self._poll_job)
+            self._poll_job = None
+    
+    def _poll_status(self):
+        """每2秒將狀態讀取提交至工作線程
+        
+        API實例存在期間持續輪詢 (僅disconnect_ccd1停止)：連線中斷時切換為未連接顯示並略過讀取，
+        背景重連恢復後自動切回已連接
+        """
+        if self.ccd1 is None:
+            self._poll_job = None
             return
         
-        self.status_thread_running = True
-        
-        def status_monitor():
-            while self.status_thread_running and self.connected:
-                try:
-                    if self.ccd1:
-                        queue_status = self.ccd1.get_queue_status()
-                        system_status = self.ccd1.get_system_status()
-                        
-                        self.root.after(0, self.update_queue_status)
-                        self.root.after(0, self.update_system_status, system_status)
-                    
-                    time.sleep(2.0)  # 2秒更新一次
-                except Exception as e:
-                    print(f"狀態監控線程異常: {e}")
-                    break
-            
-            self.status_thread_running = False
+        if not self.connected:
+            if self._ui_connected:
+                self.log_message("⚠️ CCD1連線中斷，等待自動重連...")
+                self.update_connection_ui(False)
+                self.update_system_status()
+            self._poll_job = self.root.after(2000, self._poll_status)
+            return
+        
+        if not self._ui_connected:
+            self.log_message("✅ CCD1連線已恢復")
+            self.update_connection_ui(True)
         
-        self.status_thread = threading.Thread(target=status_monitor, daemon=True)
-        self.status_thread.start()
+        future = self._executor.submit(self._cached_status)
+        future.add_done_callback(self._on_status_polled)
+        
+        self._poll_job = self.root.after(2000, self._poll_status)
     
-    def stop_status_thread(self):
-        """停止狀態監控線程"""
-        self.status_thread_running = False
-        if self.status_thread and self.status_thread.is_alive():
-            self.status_thread.join(timeout=1.0)
+    def _on_status_polled(self, future):
+        """工作線程完成狀態讀取，回到UI線程更新顯示"""
+        if self._stop_evt.is_set() or future.cancelled():
+            return
+        
+        try:
+            system_status, queue_status = future.result()
+        except Exception as e:
+            print(f"狀態輪詢異常: {e}")
+            return
+        
+        self.root.after(0, self._apply_status, system_status, queue_status)
+    
+    def _apply_status(self, system_status, queue_status: dict):
+        """套用輪詢取得的狀態"""
+        self.update_queue_status(queue_status)
+        self.update_system_status(system_status)
     
     def log_message(self, message: str):
-        """記錄訊息到文本框"""
+        """記錄訊息到緩衝區 (線程安全，由_flush_log批次寫入列表)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
+        log_entry = f"[{timestamp}] {message}"
+        color = self.LOG_COLORS.get(message[:1]) or self.LOG_COLORS.get(message[:2])
+        
+        with self._log_lock:
+            self._log_buf.append((log_entry, color))
+    
+    def _flush_log(self):
+        """將緩衝日誌一次寫入列表"""
+        with self._log_lock:
+            entries = list(self._log_buf)
+            self._log_buf.clear()
+        
+        if entries:
+            listbox = self.result_listbox
+            
+            # 使用者未向上捲動時才自動跟隨到底部
+            follow = listbox.yview()[1] >= 0.999
+            
+            for log_entry, color in entries:
+                rows = log_entry.rstrip("\n").split("\n")
+                listbox.insert(tk.END, *rows)
+                if color:
+                    size = listbox.size()
+                    for index in range(size - len(rows), size):
+                        listbox.itemconfig(index, foreground=color)
+            
+            # 只保留最後MAX_LINES行，避免列表無限增長
+            overflow = listbox.size() - self.MAX_LINES
+            if overflow > 0:
+                listbox.delete(0, overflow - 1)
+            
+            if follow:
+                listbox.see(tk.END)  # 自動滾動到底部
         
-        self.result_text.insert("end", log_entry)
-        self.result_text.see("end")  # 自動滾動到底部
+        self._log_flush_job = self.root.after(100, self._flush_log)
     
     def on_closing(self):
         """視窗關閉事件"""
-        self.stop_status_thread()
+        if self._log_flush_job:
+            self.root.after_cancel(self._log_flush_job)
+        self._stop_evt.set()
+        self.stop_status_poll()
+        # 取消尚未執行的工作，避免結束程式時等待排隊中的讀取
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._loop.call_soon_threadsafe(self._loop.stop)
         if self.ccd1:
             self.ccd1.disconnect()
         self.root.destroy()
@@ -8,20 +8,34 @@ CCD1VisionCode_YOLOv11_Enhanced.py - CCD1視覺控制系統 YOLOv11版本
 
 import sys
 import os
+import shutil
+import socket
 import time
 import threading
 import json
+import queue
+import struct
 import base64
-from typing import Optional, Dict, Any, Tuple, List
+import contextlib
+import gc
+import hashlib
+import traceback
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, List, Union
 import numpy as np
 import cv2
 from flask import Flask, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO, emit
 import logging
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from enum import IntEnum
 
+# 模組日誌 (熱路徑逐點追蹤使用DEBUG等級，生產環境可調為WARNING)
+logger = logging.getLogger("CCD1")
+logger.setLevel(logging.INFO)
+
 # 檢查YOLOv11可用性
 YOLO_AVAILABLE = False
 try:
@@ -33,6 +47,42 @@ except ImportError as e:
     print("💡 請安裝: pip install ultralytics")
     YOLO_AVAILABLE = False
 
+# 檢查CUDA可用性 (TensorRT引擎匯出需要GPU)
+TORCH_AVAILABLE = False
+CUDA_AVAILABLE = False
+try:
+    import torch
+    TORCH_AVAILABLE = True
+    CUDA_AVAILABLE = torch.cuda.is_available()
+    if CUDA_AVAILABLE:
+        # CCD1輸入解析度固定，讓cuDNN自動選擇最快的卷積演算法
+        torch.backends.cudnn.benchmark = True
+    print(f"✅ PyTorch模組導入成功 (CUDA: {CUDA_AVAILABLE})")
+except ImportError as e:
+    print(f"⚠️ PyTorch模組導入失敗，TensorRT加速不可用: {e}")
+    TORCH_AVAILABLE = False
+    CUDA_AVAILABLE = False
+
+# 檢查Numba可用性 (座標轉換核心JIT加速，可選)
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+    print("✅ Numba模組導入成功")
+except ImportError as e:
+    print(f"⚠️ Numba模組導入失敗，座標轉換使用NumPy路徑: {e}")
+    NUMBA_AVAILABLE = False
+
+# 檢查orjson可用性 (API回應以C實作序列化，可直接處理NumPy型別，可選)
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    print("✅ orjson模組導入成功")
+except ImportError as e:
+    print(f"⚠️ orjson模組導入失敗，API回應使用Flask預設JSON: {e}")
+    ORJSON_AVAILABLE = False
+
 # 導入Modbus TCP Client (適配pymodbus 3.9.2)
 try:
     from pymodbus.client import ModbusTcpClient
@@ -72,6 +122,91 @@ class StatusBits(IntEnum):
     INITIALIZED = 3
 
 
+class Reg(IntEnum):
+    """CCD1 Modbus寄存器地址 (基地址200) - YOLOv11版本"""
+    # 控制寄存器 (200-201)
+    CONTROL_COMMAND = 200           # 控制指令
+    STATUS_REGISTER = 201           # 狀態寄存器
+
+    # 模型管理寄存器 (202)
+    MODEL_SELECT = 202              # 模型選擇 (0=未指定, 1-20=模型ID)
+
+    # 完成標誌寄存器 (203-206)
+    CAPTURE_COMPLETE = 203          # 拍照完成標誌
+    DETECT_COMPLETE = 204           # 檢測完成標誌
+    OPERATION_SUCCESS = 205         # 操作成功標誌
+    ERROR_CODE = 206                # 錯誤代碼
+
+    # YOLOv11檢測參數寄存器 (210-219)
+    CONFIDENCE_HIGH = 210           # 置信度閾值高位
+    CONFIDENCE_LOW = 211            # 置信度閾值低位
+    RESERVED_212 = 212
+    RESERVED_213 = 213
+    RESERVED_214 = 214
+    RESERVED_215 = 215
+
+    # YOLOv11檢測結果寄存器 (240-259) - 方案A
+    DR_F_COUNT = 240                # DR_F檢測數量
+    RESERVED_241 = 241
+    STACK_COUNT = 242               # STACK檢測數量 (新增)
+    TOTAL_DETECTIONS = 243          # 總檢測數量
+    DETECTION_SUCCESS = 244         # 檢測成功標誌
+
+    # DR_F座標寄存器 (245-254) - 最多5個
+    DR_F_1_X = 245
+    DR_F_1_Y = 246
+    DR_F_2_X = 247
+    DR_F_2_Y = 248
+    DR_F_3_X = 249
+    DR_F_3_Y = 250
+    DR_F_4_X = 251
+    DR_F_4_Y = 252
+    DR_F_5_X = 253
+    DR_F_5_Y = 254
+    RESERVED_255 = 255
+    RESERVED_256 = 256
+
+    STACK_1_X = 257                 # STACK第1個座標X
+    STACK_1_Y = 258                 # STACK第1個座標Y
+    MODEL_ID_USED = 259             # 本次檢測使用的模型ID
+
+    # 世界座標寄存器 (260-279) - 保持不變
+    WORLD_COORD_VALID = 260
+    DR_F_1_WORLD_X_HIGH = 261
+    DR_F_1_WORLD_X_LOW = 262
+    DR_F_1_WORLD_Y_HIGH = 263
+    DR_F_1_WORLD_Y_LOW = 264
+    DR_F_2_WORLD_X_HIGH = 265
+    DR_F_2_WORLD_X_LOW = 266
+    DR_F_2_WORLD_Y_HIGH = 267
+    DR_F_2_WORLD_Y_LOW = 268
+    DR_F_3_WORLD_X_HIGH = 269
+    DR_F_3_WORLD_X_LOW = 270
+    DR_F_3_WORLD_Y_HIGH = 271
+    DR_F_3_WORLD_Y_LOW = 272
+    DR_F_4_WORLD_X_HIGH = 273
+    DR_F_4_WORLD_X_LOW = 274
+    DR_F_4_WORLD_Y_HIGH = 275
+    DR_F_4_WORLD_Y_LOW = 276
+    DR_F_5_WORLD_X_HIGH = 277
+    DR_F_5_WORLD_X_LOW = 278
+    DR_F_5_WORLD_Y_HIGH = 279
+    DR_F_5_WORLD_Y_LOW = 280
+
+    # 統計資訊寄存器 (281-299)
+    LAST_CAPTURE_TIME = 281         # 最後拍照耗時
+    LAST_PROCESS_TIME = 282         # 最後處理耗時
+    LAST_TOTAL_TIME = 283           # 最後總耗時
+    OPERATION_COUNT = 284           # 操作計數器
+    ERROR_COUNT = 285               # 錯誤計數器
+    CONNECTION_COUNT = 286          # 連接計數器
+    MODEL_SWITCH_COUNT = 287        # 模型切換次數 (新增)
+    VERSION_MAJOR = 290             # 軟體版本主版號
+    VERSION_MINOR = 291             # 軟體版本次版號
+    UPTIME_HOURS = 292              # 系統運行時間 (小時)
+    UPTIME_MINUTES = 293            # 系統運行時間 (分鐘)
+
+
 # ==================== 數據結構定義 ====================
 @dataclass
 class YOLODetectionResult:
@@ -115,12 +250,86 @@ class CalibrationStatus:
     working_dir: str = ""
 # ==================== 2. 新增YOLOModelManager類 ====================
 # 位置：在YOLOv11Detector類之前新增
+def _file_sha1(file_path: str, length: int = 10) -> str:
+    """計算檔案內容的sha1 (截短)，作為引擎快取鍵"""
+    sha1 = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()[:length]
+
+
+_ENGINE_RUNTIME_INFO = None
+
+
+def _engine_runtime_info() -> Dict[str, Optional[str]]:
+    """目前的TensorRT版本與GPU名稱，引擎快取失效判斷用"""
+    global _ENGINE_RUNTIME_INFO
+    if _ENGINE_RUNTIME_INFO is None:
+        try:
+            import tensorrt
+            trt_version = tensorrt.__version__
+        except ImportError:
+            trt_version = None
+        gpu_name = torch.cuda.get_device_name(0) if CUDA_AVAILABLE else None
+        _ENGINE_RUNTIME_INFO = {'trt_version': trt_version, 'gpu_name': gpu_name}
+    return _ENGINE_RUNTIME_INFO
+
+
+class ModelLRUCache:
+    """已載入模型的LRU快取 - 超過容量時釋放最久未使用的模型以控制顯存"""
+    
+    def __init__(self, max_size: int = 2):
+        self.max_size = max(1, max_size)
+        self._models = OrderedDict()  # {model_id: YOLO_model}
+    
+    def __contains__(self, model_id) -> bool:
+        return model_id in self._models
+    
+    def __len__(self) -> int:
+        return len(self._models)
+    
+    def __getitem__(self, model_id):
+        model = self._models[model_id]
+        self._models.move_to_end(model_id)
+        return model
+    
+    def __setitem__(self, model_id, model):
+        self._models[model_id] = model
+        self._models.move_to_end(model_id)
+        while len(self._models) > self.max_size:
+            evicted_id, evicted = self._models.popitem(last=False)
+            self._release(evicted)
+            print(f"♻️ 模型{evicted_id}已從快取移除 (LRU容量: {self.max_size})")
+    
+    def keys(self):
+        return self._models.keys()
+    
+    @staticmethod
+    def _release(model):
+        """將模型移出GPU並釋放顯存"""
+        try:
+            model.cpu()
+        except Exception:
+            pass  # TensorRT/ONNX等匯出模型不支援移至CPU
+        del model
+        if CUDA_AVAILABLE:
+            torch.cuda.empty_cache()
+        gc.collect()
+
+
 class YOLOModelManager:
     """YOLO模型管理器 - 支援多模型動態切換"""
     
-    def __init__(self, working_dir: str):
+    def __init__(self, working_dir: str, precision: str = 'fp16',
+                 calib_data: Optional[str] = None, imgsz: int = 640,
+                 max_cached_models: int = 2):
         self.working_dir = working_dir
-        self.models = {}  # {model_id: YOLO_model}
+        self.precision = precision  # 'fp16' / 'int8' / 'fp32'(不匯出引擎)
+        # INT8量化校正用的data yaml路徑，預設為 working_dir/calib.yaml
+        self.calib_data = calib_data or os.path.join(working_dir, 'calib.yaml')
+        self.imgsz = imgsz
+        self.models = ModelLRUCache(max_cached_models)  # {model_id: YOLO_model}
         self.model_paths = {}  # {model_id: file_path}
         self.current_model_id = 0  # 0=未指定模型
         self.model_switch_count = 0
@@ -134,11 +343,17 @@ class YOLOModelManager:
             print("🔍 掃描YOLO模型檔案...")
             
             # 支援的模型檔案命名模式：
+            # model_1.engine (預先建置的TensorRT引擎，GPU主機優先)
+            # model_1_openvino_model/ 或 model_1.onnx (CPU主機優先)
             # model_1.pt, model_2.pt, ... model_20.pt
             # 或 best_1.pt, best_2.pt, ... best_20.pt
             
             for i in range(1, 21):  # 1-20
-                patterns = [
+                if CUDA_AVAILABLE:
+                    accelerated = [f"model_{i}.engine"]
+                else:
+                    accelerated = [f"model_{i}_openvino_model", f"model_{i}.onnx"]
+                patterns = accelerated + [
                     f"model_{i}.pt",
                     f"best_{i}.pt", 
                     f"yolo_{i}.pt",
@@ -182,10 +397,12 @@ class YOLOModelManager:
             
             print(f"🔄 載入模型{model_id}: {self.model_paths[model_id]}")
             
-            # 載入YOLO模型
+            # 載入YOLO模型 (優先使用TensorRT引擎)
             if YOLO_AVAILABLE:
-                model = YOLO(self.model_paths[model_id])
+                model_path = self._ensure_engine(model_id)
+                model = YOLO(model_path, task='detect')
                 self.models[model_id] = model
+                self._warmup(model)
                 self.current_model_id = model_id
                 self.model_switch_count += 1
                 print(f"✅ 模型{model_id}載入成功")
@@ -198,6 +415,161 @@ class YOLOModelManager:
             print(f"❌ 載入模型{model_id}失敗: {e}")
             return False
     
+    def _warmup(self, model):
+        """以空白影像執行兩次推論，預先完成CUDA context/cuDNN初始化，避免首次檢測延遲"""
+        try:
+            dummy = np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8)
+            warmup_start = time.time()
+            for _ in range(2):
+                model.predict(dummy, imgsz=self.imgsz, verbose=False)
+            print(f"🔥 模型預熱完成，耗時: {(time.time() - warmup_start)*1000:.0f}ms")
+        except Exception as e:
+            print(f"⚠️ 模型預熱失敗: {e}")
+    
+    def _ensure_engine(self, model_id: int) -> str:
+        """取得模型的TensorRT引擎路徑，首次載入時由.pt匯出並快取於同目錄
+        
+        引擎以 (.pt內容sha1, imgsz, 精度) 命名，搬移或共用working_dir時仍可重用；
+        若存在INT8引擎則優先使用；匯出失敗或無GPU時回退到原始.pt檔案
+        """
+        model_path = self.model_paths[model_id]
+        if not model_path.endswith('.pt') or self.precision == 'fp32':
+            return model_path
+        
+        if not CUDA_AVAILABLE:
+            return self._ensure_cpu_model(model_id)
+        
+        pt_sha1 = _file_sha1(model_path)
+        
+        int8_engine_path = self._cached_engine(model_path, pt_sha1, 'int8')
+        if int8_engine_path:
+            print(f"⚡ 使用已快取的INT8 TensorRT引擎: {os.path.basename(int8_engine_path)}")
+            return int8_engine_path
+        
+        if self.precision == 'int8':
+            int8_engine = self._ensure_int8_engine(model_id, pt_sha1)
+            if int8_engine:
+                return int8_engine
+            print(f"⚠️ INT8引擎不可用，改用FP16引擎")
+        
+        engine_path = self._cached_engine(model_path, pt_sha1, 'fp16')
+        if engine_path:
+            print(f"⚡ 使用已快取的TensorRT引擎: {os.path.basename(engine_path)}")
+            return engine_path
+        
+        print(f"🔄 匯出模型{model_id}為TensorRT引擎 (FP16)，首次匯出需要數分鐘...")
+        return self._export_engine(model_path, pt_sha1, 'fp16') or model_path
+    
+    def _engine_path(self, model_path: str, pt_sha1: str, precision: str) -> str:
+        """引擎快取檔名：<名稱>_<sha1>_<imgsz>_<精度>.engine"""
+        stem = os.path.splitext(model_path)[0]
+        return f"{stem}_{pt_sha1}_{self.imgsz}_{precision}.engine"
+    
+    def _cached_engine(self, model_path: str, pt_sha1: str, precision: str) -> Optional[str]:
+        """檢查快取引擎是否存在且與目前TensorRT版本/GPU相符 (引擎不可跨GPU架構移植)"""
+        engine_path = self._engine_path(model_path, pt_sha1, precision)
+        if not os.path.exists(engine_path):
+            return None
+        
+        try:
+            with open(engine_path + '.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        
+        runtime = _engine_runtime_info()
+        if (meta.get('trt_version') != runtime['trt_version'] or
+                meta.get('gpu_name') != runtime['gpu_name']):
+            print(f"⚠️ 引擎{os.path.basename(engine_path)}建置環境不符 "
+                  f"({meta.get('gpu_name')}/{meta.get('trt_version')})，需重新匯出")
+            return None
+        return engine_path
+    
+    def _export_engine(self, model_path: str, pt_sha1: str, precision: str) -> Optional[str]:
+        """匯出TensorRT引擎並寫入json附屬檔，失敗時回傳None"""
+        engine_path = self._engine_path(model_path, pt_sha1, precision)
+        int8 = precision == 'int8'
+        
+        # Ultralytics依.pt檔名決定輸出名稱，先複製為快取檔名再匯出
+        export_pt_path = os.path.splitext(engine_path)[0] + '.pt'
+        try:
+            shutil.copyfile(model_path, export_pt_path)
+            export_kwargs = dict(format='engine', half=not int8, int8=int8,
+                                 imgsz=self.imgsz, device=0, workspace=4)
+            if int8:
+                export_kwargs['data'] = self.calib_data
+            exported = YOLO(export_pt_path).export(**export_kwargs)
+            if not exported or not os.path.exists(str(exported)):
+                return None
+            if os.path.abspath(str(exported)) != os.path.abspath(engine_path):
+                os.replace(str(exported), engine_path)
+            
+            meta = {'pt_sha1': pt_sha1, 'imgsz': self.imgsz, 'precision': precision}
+            meta.update(_engine_runtime_info())
+            with open(engine_path + '.json', 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+            
+            print(f"✅ TensorRT引擎匯出成功: {os.path.basename(engine_path)}")
+            return engine_path
+        except Exception as e:
+            print(f"⚠️ TensorRT引擎匯出失敗 ({precision}): {e}")
+            return None
+        finally:
+            if os.path.exists(export_pt_path):
+                os.remove(export_pt_path)
+    
+    def _ensure_cpu_model(self, model_id: int) -> str:
+        """無CUDA主機：優先使用OpenVINO IR或ONNX，缺少時由.pt匯出OpenVINO並快取
+        
+        匯出失敗時回退到原始.pt檔案 (PyTorch CPU推論)
+        """
+        model_path = self.model_paths[model_id]
+        stem = os.path.splitext(model_path)[0]
+        
+        openvino_dir = stem + '_openvino_model'
+        if os.path.isdir(openvino_dir):
+            print(f"⚡ 使用已快取的OpenVINO模型: {os.path.basename(openvino_dir)}")
+            return openvino_dir
+        
+        onnx_path = stem + '.onnx'
+        if os.path.exists(onnx_path):
+            print(f"⚡ 使用已快取的ONNX模型: {os.path.basename(onnx_path)}")
+            return onnx_path
+        
+        try:
+            print(f"🔄 CUDA不可用，匯出模型{model_id}為OpenVINO格式...")
+            exported = YOLO(model_path).export(format='openvino', half=True, imgsz=self.imgsz)
+            if exported and os.path.exists(str(exported)):
+                print(f"✅ OpenVINO模型匯出成功: {os.path.basename(str(exported))}")
+                return str(exported)
+        except Exception as e:
+            print(f"⚠️ OpenVINO匯出失敗，使用PyTorch CPU推論: {e}")
+        
+        return model_path
+    
+    def _ensure_int8_engine(self, model_id: int, pt_sha1: Optional[str] = None) -> Optional[str]:
+        """以訓練後量化(PTQ)匯出INT8 TensorRT引擎
+        
+        校正資料約定：working_dir/calib.yaml 指向 calib/ 子資料夾，
+        其中放置100-500張具代表性的產線影像。
+        輸出引擎與FP16引擎並存 (<名稱>_<sha1>_<imgsz>_int8.engine)。
+        """
+        model_path = self.model_paths[model_id]
+        if not CUDA_AVAILABLE or not model_path.endswith('.pt'):
+            return None
+        
+        pt_sha1 = pt_sha1 or _file_sha1(model_path)
+        int8_engine_path = self._cached_engine(model_path, pt_sha1, 'int8')
+        if int8_engine_path:
+            return int8_engine_path
+        
+        if not os.path.exists(self.calib_data):
+            print(f"⚠️ 找不到INT8校正資料: {self.calib_data}")
+            return None
+        
+        print(f"🔄 匯出模型{model_id}為INT8 TensorRT引擎，校正資料: {self.calib_data}")
+        return self._export_engine(model_path, pt_sha1, 'int8')
+    
     def get_current_model(self):
         """獲取當前模型"""
         if self.current_model_id in self.models:
@@ -212,14 +584,82 @@ class YOLOModelManager:
         """檢查是否有模型已載入"""
         return self.current_model_id > 0 and self.current_model_id in self.models
 # ==================== YOLOv11檢測器 ====================
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _preprocess_yolo(bgr, out, scale, new_h, new_w, pad_top, pad_left):
+        """單次掃描完成letterbox雙線性縮放 + BGR→RGB + HWC→CHW + /255，直接寫入out(3,H,W)"""
+        src_h = bgr.shape[0]
+        src_w = bgr.shape[1]
+        out_h = out.shape[1]
+        out_w = out.shape[2]
+        inv_scale = 1.0 / scale
+        norm = 1.0 / 255.0
+        fill = 114.0 / 255.0
+        for y in prange(out_h):
+            oy = y - pad_top
+            row_valid = 0 <= oy < new_h
+            sy = (oy + 0.5) * inv_scale - 0.5
+            if sy < 0.0:
+                sy = 0.0
+            y0 = int(sy)
+            if y0 > src_h - 1:
+                y0 = src_h - 1
+            y1 = min(y0 + 1, src_h - 1)
+            wy = sy - y0
+            for x in range(out_w):
+                ox = x - pad_left
+                if not row_valid or ox < 0 or ox >= new_w:
+                    out[0, y, x] = fill
+                    out[1, y, x] = fill
+                    out[2, y, x] = fill
+                    continue
+                sx = (ox + 0.5) * inv_scale - 0.5
+                if sx < 0.0:
+                    sx = 0.0
+                x0 = int(sx)
+                if x0 > src_w - 1:
+                    x0 = src_w - 1
+                x1 = min(x0 + 1, src_w - 1)
+                wx = sx - x0
+                for c in range(3):
+                    sc = 2 - c  # BGR→RGB
+                    top = bgr[y0, x0, sc] * (1.0 - wx) + bgr[y0, x1, sc] * wx
+                    bottom = bgr[y1, x0, sc] * (1.0 - wx) + bgr[y1, x1, sc] * wx
+                    out[c, y, x] = (top * (1.0 - wy) + bottom * wy) * norm
+
+
 class YOLOv11Detector:
     """YOLOv11物件檢測器 - 支援多模型切換和三種分類"""
     
-    def __init__(self, working_dir: str, confidence_threshold: float = 0.8):
+    def __init__(self, working_dir: str, confidence_threshold: float = 0.8,
+                 precision: str = 'fp16', calib_data: Optional[str] = None):
         self.working_dir = working_dir
         self.confidence_threshold = confidence_threshold
-        self.model_manager = YOLOModelManager(working_dir)
+        self.model_manager = YOLOModelManager(working_dir, precision=precision, calib_data=calib_data)
         self.class_names = ['DR_F', 'stack']  # 2種類型
+        self.imgsz = self.model_manager.imgsz
+        
+        # 影像雙緩衝池：相機幀直接寫入，避免每幀配置新陣列
+        self._frame_pool: List[np.ndarray] = []
+        self._frame_index = -1
+        
+        # GPU推論緩衝區：固定頁(pinned)主機緩衝 + 常駐CUDA張量，避免每幀重新配置顯存
+        self._pinned = None
+        self._pinned_np = None
+        self._gpu = None
+        self._stream = None
+        if CUDA_AVAILABLE:
+            try:
+                # Numba CPU核心無法寫入float16，使用融合前處理時改以float32緩衝
+                buffer_dtype = torch.float32 if NUMBA_AVAILABLE else torch.float16
+                self._pinned = torch.empty((1, 3, self.imgsz, self.imgsz), dtype=buffer_dtype, pin_memory=True)
+                self._pinned_np = self._pinned.numpy()
+                self._gpu = torch.empty_like(self._pinned, device='cuda')
+                self._stream = torch.cuda.Stream()
+                print(f"✅ GPU推論緩衝區已配置: {self.imgsz}x{self.imgsz} {'FP32' if NUMBA_AVAILABLE else 'FP16'}")
+            except Exception as e:
+                print(f"⚠️ GPU推論緩衝區配置失敗，使用預設輸入路徑: {e}")
+                self._pinned = self._pinned_np = self._gpu = self._stream = None
         
         # 檢查是否有可用模型，如果有則載入模型1
         if 1 in self.model_manager.model_paths:
@@ -238,6 +678,54 @@ class YOLOv11Detector:
         self.confidence_threshold = max(0.1, min(1.0, threshold))
         print(f"🎯 置信度閾值更新為: {self.confidence_threshold}")
     
+    def get_frame_buffer(self, shape: Tuple[int, ...]) -> Tuple[int, np.ndarray]:
+        """輪流回傳雙緩衝池中的下一個影像緩衝區 (形狀改變時重新配置)
+        
+        緩衝區會在之後的拍照中被重複使用，呼叫端需序列化拍照
+        (CCD1VisionController以_capture_lock保證)
+        
+        Returns:
+            (緩衝區索引, 緩衝區)
+        """
+        if not self._frame_pool or self._frame_pool[0].shape != tuple(shape):
+            self._frame_pool = [np.empty(shape, dtype=np.uint8) for _ in range(2)]
+            self._frame_index = -1
+        self._frame_index = (self._frame_index + 1) % len(self._frame_pool)
+        return self._frame_index, self._frame_pool[self._frame_index]
+    
+    def _upload_letterboxed(self, image: np.ndarray) -> Tuple[float, int, int]:
+        """將BGR影像letterbox後寫入pinned緩衝，再非同步複製到常駐CUDA張量
+        
+        Returns:
+            (縮放比例, 左側填充, 上方填充)，用於將檢測座標還原到原圖
+        """
+        # 灰階相機幀先轉為3通道 (原先直接交給Ultralytics時可接受灰階，此路徑需保持相容)
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        
+        h, w = image.shape[:2]
+        scale = min(self.imgsz / h, self.imgsz / w)
+        new_w, new_h = int(round(w * scale)), int(round(h * scale))
+        pad_x = (self.imgsz - new_w) // 2
+        pad_y = (self.imgsz - new_h) // 2
+        
+        if NUMBA_AVAILABLE:
+            # 融合核心：一次掃描完成縮放、通道交換、轉置與歸一化
+            _preprocess_yolo(image, self._pinned_np[0], scale, new_h, new_w, pad_y, pad_x)
+        else:
+            resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+            
+            # BGR→RGB、HWC→CHW、歸一化，直接寫入pinned緩衝
+            self._pinned_np.fill(114 / 255.0)
+            self._pinned_np[0, :, pad_y:pad_y + new_h, pad_x:pad_x + new_w] = \
+                resized[:, :, ::-1].transpose(2, 0, 1) * (1 / 255.0)
+        
+        with torch.cuda.stream(self._stream):
+            self._gpu.copy_(self._pinned, non_blocking=True)
+        torch.cuda.current_stream().wait_stream(self._stream)
+        
+        return scale, pad_x, pad_y
+    
     def detect(self, image: np.ndarray) -> YOLODetectionResult:
         """執行YOLOv11檢測 - 支援三種分類"""
         start_time = time.time()
@@ -254,34 +742,41 @@ class YOLOv11Detector:
                     result.error_message = f"模型{self.model_manager.current_model_id}未載入"
                 return result
             
-            # 執行推論
-            results = current_model(image, conf=self.confidence_threshold, verbose=False)
+            # 執行推論 (有GPU緩衝區時使用常駐CUDA張量作為輸入)
+            # inference_mode比no_grad更徹底地關閉autograd追蹤
+            scale, pad_x, pad_y = 1.0, 0, 0
+            with torch.inference_mode() if TORCH_AVAILABLE else contextlib.nullcontext():
+                if self._gpu is not None:
+                    scale, pad_x, pad_y = self._upload_letterboxed(image)
+                    results = current_model.predict(self._gpu, conf=self.confidence_threshold, verbose=False)
+                else:
+                    results = current_model(image, conf=self.confidence_threshold, verbose=False)
             
             # 處理檢測結果
             if results and len(results) > 0:
                 detections = results[0]
                 
                 if detections.boxes is not None and len(detections.boxes) > 0:
-                    boxes = detections.boxes.cpu().numpy()
+                    # 在GPU上先以置信度過濾，僅將保留的列 [x1,y1,x2,y2,conf,cls] 一次傳回主機
+                    boxes = detections.boxes
+                    kept = boxes.data[boxes.conf >= self.confidence_threshold]
+                    if hasattr(kept, 'cpu'):
+                        kept = kept.cpu().numpy()
                     
-                    for box in boxes:
-                        # 獲取類別ID和置信度
-                        class_id = int(box.cls[0])
-                        confidence = float(box.conf[0])
-                        
-                        if confidence >= self.confidence_threshold:
-                            # 計算中心點座標
-                            x1, y1, x2, y2 = box.xyxy[0]
-                            center_x = float((x1 + x2) / 2)
-                            center_y = float((y1 + y2) / 2)
-                            
-                            # 根據類別分類
-                            if class_id == 0:  # DR_F
-                                result.dr_f_coords.append((center_x, center_y))
-                                result.dr_f_count += 1
-                            elif class_id == 1:  # stack  
-                                result.stack_coords.append((center_x, center_y))
-                                result.stack_count += 1
+                    cls = kept[:, 5].astype(np.int32)
+                    xyxy = kept[:, :4]
+                    
+                    # 計算中心點座標並還原到原圖
+                    cx = ((xyxy[:, 0] + xyxy[:, 2]) * 0.5 - pad_x) / scale
+                    cy = ((xyxy[:, 1] + xyxy[:, 3]) * 0.5 - pad_y) / scale
+                    
+                    # 根據類別分類 (0=DR_F, 1=stack)
+                    dr_f_mask = cls == 0
+                    stack_mask = cls == 1
+                    result.dr_f_coords = list(map(tuple, np.stack([cx[dr_f_mask], cy[dr_f_mask]], 1).tolist()))
+                    result.stack_coords = list(map(tuple, np.stack([cx[stack_mask], cy[stack_mask]], 1).tolist()))
+                    result.dr_f_count = int(dr_f_mask.sum())
+                    result.stack_count = int(stack_mask.sum())
                     
                     result.total_detections = result.dr_f_count + result.stack_count
                     result.success = True
@@ -292,7 +787,7 @@ class YOLOv11Detector:
                 
         except Exception as e:
             result.error_message = f"YOLOv11檢測失敗: {e}"
-            print(f"❌ YOLOv11檢測異常: {e}")
+            logger.error("YOLOv11檢測異常: %s", e)
         
         result.processing_time = (time.time() - start_time) * 1000
         return result
@@ -300,6 +795,78 @@ class YOLOv11Detector:
 
 
 # ==================== 座標轉換器 ====================
+def _load_npy(file_path: str):
+    """載入NPY檔案，純數值陣列使用mmap避免整檔讀入，含Python物件時回退pickle載入"""
+    try:
+        return np.load(file_path, mmap_mode='r')
+    except ValueError:
+        return np.load(file_path, allow_pickle=True)
+
+
+def _read_npy_header(file_path: str) -> Tuple[Optional[Tuple[int, ...]], bool]:
+    """只讀取NPY檔案標頭，回傳(shape, dtype是否含Python物件)，不載入陣列本體"""
+    with open(file_path, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+    return tuple(shape), dtype.hasobject
+
+
+# 超過此點數時改用平行版本的反投影核心
+_BACKPROJECT_PARALLEL_MIN = 1000
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _backproject_z0(und_xy, RT, t):
+        """歸一化座標反投影到Z=0平面，回傳(N,2)世界座標與有效遮罩"""
+        n = und_xy.shape[0]
+        world = np.empty((n, 2))
+        valid = np.empty(n, dtype=np.bool_)
+        for i in range(n):
+            x = und_xy[i, 0]
+            y = und_xy[i, 1]
+            denom = RT[0, 2] * x + RT[1, 2] * y + RT[2, 2]
+            if abs(denom) < 1e-6:
+                valid[i] = False
+                world[i, 0] = 0.0
+                world[i, 1] = 0.0
+                continue
+            s = -t[2] / denom
+            cx = s * x - t[0]
+            cy = s * y - t[1]
+            cz = s - t[2]
+            world[i, 0] = RT[0, 0] * cx + RT[0, 1] * cy + RT[0, 2] * cz
+            world[i, 1] = RT[1, 0] * cx + RT[1, 1] * cy + RT[1, 2] * cz
+            valid[i] = True
+        return world, valid
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _backproject_z0_parallel(und_xy, RT, t):
+        """_backproject_z0的平行版本，適用於大量點"""
+        n = und_xy.shape[0]
+        world = np.empty((n, 2))
+        valid = np.empty(n, dtype=np.bool_)
+        for i in prange(n):
+            x = und_xy[i, 0]
+            y = und_xy[i, 1]
+            denom = RT[0, 2] * x + RT[1, 2] * y + RT[2, 2]
+            if abs(denom) < 1e-6:
+                valid[i] = False
+                world[i, 0] = 0.0
+                world[i, 1] = 0.0
+            else:
+                s = -t[2] / denom
+                cx = s * x - t[0]
+                cy = s * y - t[1]
+                cz = s - t[2]
+                world[i, 0] = RT[0, 0] * cx + RT[0, 1] * cy + RT[0, 2] * cz
+                world[i, 1] = RT[1, 0] * cx + RT[1, 1] * cy + RT[1, 2] * cz
+                valid[i] = True
+        return world, valid
+
+
 class CameraCoordinateTransformer:
     """相機座標轉換器 - 修正版，基於原版CCD1實現"""
     
@@ -310,39 +877,50 @@ class CameraCoordinateTransformer:
         self.tvec = None
         self.rotation_matrix = None
         self.is_valid_flag = False
+        
+        # 載入時預先計算的轉換常數 (連續記憶體，供BLAS直接使用)
+        self._R3 = None
+        self._R = None
+        self._RT = None
+        self._tvec_flat = None
+        self._neg_tz = 0.0
+        self._b = None
     
     def load_calibration_data(self, intrinsic_file: str, extrinsic_file: str) -> bool:
-        """載入標定數據 - 保持原有檔案載入邏輯"""
+        """載入標定數據 - 保持原有檔案載入邏輯 (解析後交由set_calibration)"""
         try:
             print(f"🔄 CameraCoordinateTransformer載入標定數據...")
             print(f"   內參檔案: {intrinsic_file}")
             print(f"   外參檔案: {extrinsic_file}")
             
+            camera_matrix = None
+            dist_coeffs = np.zeros((1, 5))  # 預設零值畸變係數
+            rvec = None
+            tvec = None
+            
             # 載入內參 (相機矩陣) - 保持原有邏輯
             try:
-                intrinsic_data = np.load(intrinsic_file, allow_pickle=True)
+                intrinsic_data = _load_npy(intrinsic_file)
                 
                 if hasattr(intrinsic_data, 'shape') and intrinsic_data.shape == (3, 3):
                     # 直接是3x3數組
-                    self.camera_matrix = intrinsic_data
-                    self.dist_coeffs = np.zeros((1, 5))  # 使用零值畸變係數
+                    camera_matrix = intrinsic_data
                     print(f"   ✅ 載入3x3相機矩陣，使用零值畸變係數")
                 elif isinstance(intrinsic_data, dict):
                     # 字典格式
-                    self.camera_matrix = intrinsic_data['camera_matrix']
-                    self.dist_coeffs = intrinsic_data.get('dist_coeffs', np.zeros((1, 5)))
+                    camera_matrix = intrinsic_data['camera_matrix']
+                    dist_coeffs = intrinsic_data.get('dist_coeffs', dist_coeffs)
                     print(f"   ✅ 從字典載入相機矩陣和畸變係數")
                 elif hasattr(intrinsic_data, 'item') and callable(intrinsic_data.item):
                     # 字典項目格式
                     dict_data = intrinsic_data.item()
                     if isinstance(dict_data, dict):
-                        self.camera_matrix = dict_data['camera_matrix']
-                        self.dist_coeffs = dict_data.get('dist_coeffs', np.zeros((1, 5)))
+                        camera_matrix = dict_data['camera_matrix']
+                        dist_coeffs = dict_data.get('dist_coeffs', dist_coeffs)
                         print(f"   ✅ 從字典項目載入相機矩陣和畸變係數")
                 else:
                     # 直接作為相機矩陣使用
-                    self.camera_matrix = intrinsic_data
-                    self.dist_coeffs = np.zeros((1, 5))
+                    camera_matrix = intrinsic_data
                     print(f"   ✅ 直接使用數據作為相機矩陣")
                     
             except Exception as e1:
@@ -353,40 +931,59 @@ class CameraCoordinateTransformer:
             dist_coeffs_file = intrinsic_file.replace('camera_matrix', 'dist_coeffs')
             if os.path.exists(dist_coeffs_file) and dist_coeffs_file != intrinsic_file:
                 try:
-                    dist_data = np.load(dist_coeffs_file, allow_pickle=True)
+                    dist_data = _load_npy(dist_coeffs_file)
                     if hasattr(dist_data, 'shape'):
-                        self.dist_coeffs = dist_data
+                        dist_coeffs = dist_data
                         print(f"   ✅ 載入單獨的畸變係數檔案: {dist_data.shape}")
                 except Exception as e:
                     print(f"   ⚠️ 載入畸變係數檔案失敗，使用零值: {e}")
             
             # 載入外參
             try:
-                extrinsic_data = np.load(extrinsic_file, allow_pickle=True)
+                extrinsic_data = _load_npy(extrinsic_file)
                 
                 if isinstance(extrinsic_data, dict):
                     # 直接字典格式
-                    self.rvec = extrinsic_data['rvec']
-                    self.tvec = extrinsic_data['tvec']
+                    rvec = extrinsic_data['rvec']
+                    tvec = extrinsic_data['tvec']
                     print(f"   ✅ 從字典載入外參")
                 elif hasattr(extrinsic_data, 'item') and callable(extrinsic_data.item) and extrinsic_data.shape == ():
                     # 0維數組包含字典
                     dict_data = extrinsic_data.item()
                     if isinstance(dict_data, dict):
-                        self.rvec = dict_data['rvec']
-                        self.tvec = dict_data['tvec']
+                        rvec = dict_data['rvec']
+                        tvec = dict_data['tvec']
                         print(f"   ✅ 從字典項目載入外參")
                 else:
                     print(f"   ❌ 未知的外參檔案格式")
                     return False
                 
-                # 🔥 關鍵修正：計算旋轉矩陣
-                self.rotation_matrix, _ = cv2.Rodrigues(self.rvec)
-                
             except Exception as e2:
                 print(f"   ❌ 外參載入失敗: {e2}")
                 return False
             
+            return self.set_calibration(camera_matrix, dist_coeffs, rvec, tvec)
+            
+        except Exception as e:
+            print(f"   ❌ 座標轉換器載入失敗: {e}")
+            print(f"   詳細錯誤: {traceback.format_exc()}")
+            return False
+    
+    def set_calibration(self, camera_matrix: np.ndarray, dist_coeffs: np.ndarray,
+                        rvec: np.ndarray, tvec: np.ndarray) -> bool:
+        """以已解析的陣列設置標定數據"""
+        try:
+            self.is_valid_flag = False
+            
+            # 複製為記憶體中的float64陣列 (來源可能是mmap)
+            self.camera_matrix = np.array(camera_matrix, dtype=np.float64)
+            self.dist_coeffs = np.array(dist_coeffs, dtype=np.float64)
+            self.rvec = np.array(rvec, dtype=np.float64)
+            self.tvec = np.array(tvec, dtype=np.float64).reshape(3, 1)
+            
+            # 🔥 關鍵修正：計算旋轉矩陣
+            self.rotation_matrix, _ = cv2.Rodrigues(self.rvec)
+            
             # 驗證載入的數據
             print(f"   📊 載入數據驗證:")
             print(f"      相機矩陣: {self.camera_matrix.shape}, det={np.linalg.det(self.camera_matrix):.2f}")
@@ -395,104 +992,87 @@ class CameraCoordinateTransformer:
             print(f"      平移向量: {self.tvec.shape}, 範圍: [{self.tvec.min():.3f}, {self.tvec.max():.3f}]")
             print(f"      旋轉矩陣: {self.rotation_matrix.shape}, det={np.linalg.det(self.rotation_matrix):.3f}")
             
+            self._precompute_transform()
+            
             self.is_valid_flag = True
             print(f"   ✅ 座標轉換器載入成功")
             return True
             
         except Exception as e:
-            print(f"   ❌ 座標轉換器載入失敗: {e}")
-            import traceback
-            print(f"   詳細錯誤: {traceback.format_exc()}")
+            print(f"   ❌ 座標轉換器設置失敗: {e}")
             return False
     
+    def _precompute_transform(self):
+        """預先計算pixel_to_world使用的不變量"""
+        self._R3 = self.rotation_matrix[2, :].astype(np.float64).copy()
+        self._RT = self.rotation_matrix.T.astype(np.float64).copy()
+        self._tvec_flat = np.asarray(self.tvec).reshape(3).astype(np.float64).copy()
+        self._neg_tz = -float(self._tvec_flat[2])
+        # world = R^T·cam - R^T·t，平移項預先算好；列向量形式 world = cam @ R + b
+        self._R = self.rotation_matrix.astype(np.float64).copy()
+        self._b = -(self._RT @ self._tvec_flat)
+    
     def pixel_to_world(self, pixel_coords: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
         """
         像素座標轉世界座標 - 修正版實現
         基於原版CCD1的正確數學模型
         """
         if not self.is_valid_flag:
-            print(f"❌ 標定數據無效，無法進行座標轉換")
+            logger.warning("標定數據無效，無法進行座標轉換")
+            return []
+        
+        if not pixel_coords:
             return []
         
         try:
-            world_coords = []
-            
-            for px, py in pixel_coords:
-                print(f"🔄 轉換像素座標: ({px:.1f}, {py:.1f})")
-                
-                # 🔥 步驟1: 去畸變處理
-                # 將像素座標轉換為正確的輸入格式
-                pixel_point = np.array([[[float(px), float(py)]]], dtype=np.float32)
-                
-                # 使用cv2.undistortPoints進行去畸變，但不使用P參數
-                undistorted_points = cv2.undistortPoints(
-                    pixel_point, 
-                    self.camera_matrix, 
-                    self.dist_coeffs
-                )
-                
-                # 獲取歸一化座標
-                x_norm, y_norm = undistorted_points[0][0]
-                print(f"   去畸變後歸一化座標: ({x_norm:.6f}, {y_norm:.6f})")
-                
-                # 🔥 步驟2: 構建歸一化齊次座標
-                normalized_coords = np.array([x_norm, y_norm, 1.0])
-                
-                # 🔥 步驟3: 計算深度係數 (Z=0平面投影)
-                # 基於原版CCD1的數學模型：s = -t_z / (R3 · normalized_coords)
-                # 其中R3是旋轉矩陣的第三行
-                R3 = self.rotation_matrix[2, :]  # 旋轉矩陣第三行
-                denominator = np.dot(R3, normalized_coords)
-                
-                if abs(denominator) < 1e-6:
-                    print(f"   ⚠️ 分母接近零，跳過此點: denominator={denominator}")
-                    continue
-                
-                # Z=0平面，所以目標Z座標為0
-                depth_scale = (0 - self.tvec[2, 0]) / denominator
-                print(f"   深度係數: {depth_scale:.6f}")
-                
-                # 🔥 步驟4: 計算相機座標系中的3D點
-                camera_point = depth_scale * normalized_coords
-                print(f"   相機座標系點: ({camera_point[0]:.3f}, {camera_point[1]:.3f}, {camera_point[2]:.3f})")
-                
-                # 🔥 步驟5: 轉換到世界座標系
-                # world_point = R^(-1) * (camera_point - tvec)
-                # 其中tvec需要reshape為3x1向量
-                tvec_3d = self.tvec.reshape(3)
-                
-                # 計算：camera_point - tvec
-                translated_point = camera_point - tvec_3d
-                
-                # 計算：R^(-1) * translated_point
-                # R^(-1) = R^T (對於旋轉矩陣)
-                world_point_3d = np.dot(self.rotation_matrix.T, translated_point)
-                
-                # 取X, Y座標 (忽略Z座標，因為投影到Z=0平面)
-                world_x = world_point_3d[0]
-                world_y = world_point_3d[1]
-                
-                print(f"   ✅ 世界座標: ({world_x:.3f}, {world_y:.3f}) mm")
-                
-                world_coords.append((float(world_x), float(world_y)))
-            
-            print(f"✅ 座標轉換完成，共轉換{len(world_coords)}個點")
+            # 🔥 步驟1: 批次去畸變，取得歸一化座標 (N,1,2)
+            pts = np.asarray(pixel_coords, dtype=np.float32).reshape(-1, 1, 2)
+            undistorted = cv2.undistortPoints(pts, self.camera_matrix, self.dist_coeffs)
+            n = undistorted.shape[0]
+            
+            # 🔥 步驟2-5: Numba可用時以JIT核心一次完成反投影，避免中間陣列
+            if NUMBA_AVAILABLE:
+                und_xy = np.ascontiguousarray(undistorted.reshape(n, 2), dtype=np.float64)
+                kernel = _backproject_z0_parallel if n >= _BACKPROJECT_PARALLEL_MIN else _backproject_z0
+                world_points, valid = kernel(und_xy, self._RT, self._tvec_flat)
+                if not valid.all():
+                    logger.warning("%d個點分母接近零，已跳過", int((~valid).sum()))
+                world_coords = list(map(tuple, world_points[valid].tolist()))
+                logger.debug("座標轉換完成，共轉換%d個點", len(world_coords))
+                return world_coords
+            
+            # 🔥 步驟2: 構建歸一化齊次座標 (N,3)
+            norm = np.concatenate([undistorted.reshape(n, 2).astype(np.float64), np.ones((n, 1))], axis=1)
+            
+            # 🔥 步驟3: 計算深度係數 (Z=0平面投影)
+            # 基於原版CCD1的數學模型：s = -t_z / (R3 · normalized_coords)
+            denom = norm @ self._R3
+            mask = np.abs(denom) >= 1e-6
+            if not mask.all():
+                logger.warning("%d個點分母接近零，已跳過", int((~mask).sum()))
+            depth_scale = self._neg_tz / denom[mask]
+            
+            # 🔥 步驟4: 相機座標系中的3D點
+            camera_points = depth_scale[:, None] * norm[mask]
+            
+            # 🔥 步驟5: 轉換到世界座標系 world = R^T (camera_point - tvec)，單次GEMM加廣播平移
+            world_points = camera_points @ self._R + self._b
+            
+            world_coords = list(map(tuple, world_points[:, :2].tolist()))
+            logger.debug("座標轉換完成，共轉換%d個點", len(world_coords))
             return world_coords
             
-        except Exception as e:
-            print(f"❌ 座標轉換失敗: {e}")
-            import traceback
-            print(f"詳細錯誤堆疊: {traceback.format_exc()}")
+        except Exception:
+            logger.exception("座標轉換失敗")
             return []
     
     def is_valid(self) -> bool:
-        """檢查轉換器是否有效"""
-        return (self.is_valid_flag and 
-                self.camera_matrix is not None and 
-                self.dist_coeffs is not None and 
-                self.rvec is not None and 
-                self.tvec is not None and 
-                self.rotation_matrix is not None)
+        """檢查轉換器是否有效
+        
+        is_valid_flag只在set_calibration設置完全部陣列與預計算量之後才置為True，
+        重新載入開始時先清為False，因此旗標本身即代表完整的有效性
+        """
+        return self.is_valid_flag
 
 
 # ==================== 標定管理器 ====================
@@ -504,6 +1084,10 @@ class CalibrationManager:
         self.transformer = CameraCoordinateTransformer()
         self.status = CalibrationStatus()
         self.status.working_dir = working_dir
+        
+        # get_status快取：狀態欄位未變化時直接返回上次的字典
+        self._status_key: Optional[tuple] = None
+        self._status_dict: Dict[str, Any] = {}
     
     def scan_calibration_files(self) -> Dict[str, Any]:
         """修正版標定檔案掃描"""
@@ -516,10 +1100,19 @@ class CalibrationManager:
                     'error': f"工作目錄不存在: {self.working_dir}"
                 }
             
-            all_files = os.listdir(self.working_dir)
-            npy_files = [f for f in all_files if f.endswith('.npy')]
+            # 單次scandir取得檔名與路徑，檔案類型判斷使用目錄項目快取的stat
+            file_count = 0
+            npy_entries = []
+            with os.scandir(self.working_dir) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    file_count += 1
+                    if entry.name.endswith('.npy'):
+                        npy_entries.append((entry.name, entry.path))
+            npy_files = [name for name, _ in npy_entries]
             
-            print(f"📁 發現 {len(all_files)} 個檔案，其中 {len(npy_files)} 個NPY檔案")
+            print(f"📁 發現 {file_count} 個檔案，其中 {len(npy_files)} 個NPY檔案")
             
             if not npy_files:
                 return {
@@ -533,8 +1126,7 @@ class CalibrationManager:
             extrinsic_files = []
             unknown_files = []
             
-            for file in npy_files:
-                file_path = os.path.join(self.working_dir, file)
+            for file, file_path in npy_entries:
                 file_type = self._classify_file_fixed(file, file_path)
                 
                 if file_type == 'camera_matrix':
@@ -585,8 +1177,9 @@ class CalibrationManager:
     def _classify_file_fixed(self, filename: str, file_path: str) -> str:
         """修正版檔案分類邏輯"""
         try:
-            # 載入檔案
-            data = np.load(file_path, allow_pickle=True)
+            # 僅讀取NPY標頭取得shape/dtype；含Python物件(字典)時才完整載入
+            shape, has_object = _read_npy_header(file_path)
+            data = np.load(file_path, allow_pickle=True) if has_object else None
             
             # 檔案名稱關鍵字分析
             file_lower = filename.lower()
@@ -621,19 +1214,19 @@ class CalibrationManager:
                     pass
             
             # 3. 基於數組形狀和檔案名稱判斷
-            if hasattr(data, 'shape'):
+            if shape is not None:
                 # 3x3矩陣 - 相機內參矩陣
-                if data.shape == (3, 3):
+                if shape == (3, 3):
                     if is_camera_matrix or (not is_dist_coeffs and not is_extrinsic):
                         return 'camera_matrix'
                 
                 # 畸變係數向量
-                elif data.shape in [(5,), (6,), (8,), (1, 5), (1, 8), (5, 1), (8, 1)]:
+                elif shape in [(5,), (6,), (8,), (1, 5), (1, 8), (5, 1), (8, 1)]:
                     if is_dist_coeffs or (not is_camera_matrix and not is_extrinsic):
                         return 'dist_coeffs'
                 
                 # 外參矩陣
-                elif data.shape in [(4, 4), (3, 4)]:
+                elif shape in [(4, 4), (3, 4)]:
                     if is_extrinsic or (not is_camera_matrix and not is_dist_coeffs):
                         return 'extrinsic'
                 
@@ -683,7 +1276,7 @@ class CalibrationManager:
             
             if camera_matrix_file:
                 camera_path = os.path.join(self.working_dir, camera_matrix_file)
-                camera_data = np.load(camera_path, allow_pickle=True)
+                camera_data = _load_npy(camera_path)
                 
                 # 修正: 根據測試結果，camera_matrix_DR.npy是直接的3x3數組
                 if isinstance(camera_data, dict):
@@ -707,7 +1300,7 @@ class CalibrationManager:
             # 載入畸變係數 (如果單獨提供且之前沒載入)
             if dist_coeffs_file and dist_coeffs is None:
                 dist_path = os.path.join(self.working_dir, dist_coeffs_file)
-                dist_data = np.load(dist_path, allow_pickle=True)
+                dist_data = _load_npy(dist_path)
                 
                 # 修正: 根據測試結果，dist_coeffs_DR.npy是(1,5)數組
                 if hasattr(dist_data, 'shape'):
@@ -725,7 +1318,7 @@ class CalibrationManager:
             
             if extrinsic_file:
                 ext_path = os.path.join(self.working_dir, extrinsic_file)
-                ext_data = np.load(ext_path, allow_pickle=True)
+                ext_data = _load_npy(ext_path)
                 
                 # 修正: 根據測試結果，extrinsic_DR.npy是0維數組包含字典
                 if isinstance(ext_data, dict):
@@ -753,11 +1346,8 @@ class CalibrationManager:
                     'error': f'外參數據載入失敗: rvec={rvec is not None}, tvec={tvec is not None}'
                 }
             
-            # 創建座標轉換器 (使用您原有的CameraCoordinateTransformer)
-            success = self.transformer.load_calibration_data(
-                os.path.join(self.working_dir, camera_matrix_file),
-                os.path.join(self.working_dir, extrinsic_file)
-            )
+            # 將已解析的陣列交給座標轉換器，避免重複讀檔
+            success = self.transformer.set_calibration(camera_matrix, dist_coeffs, rvec, tvec)
             
             if success:
                 self.status.intrinsic_loaded = True
@@ -785,43 +1375,56 @@ class CalibrationManager:
                 
         except Exception as e:
             print(f"❌ 載入標定數據失敗: {e}")
-            import traceback
             print(f"詳細錯誤: {traceback.format_exc()}")
             return {'success': False, 'error': f"載入標定數據失敗: {e}"}
     
     def get_status(self) -> Dict[str, Any]:
-        """獲取標定狀態"""
-        return {
-            'intrinsic_loaded': self.status.intrinsic_loaded,
-            'extrinsic_loaded': self.status.extrinsic_loaded,
-            'transformer_valid': self.status.transformer_valid,
-            'intrinsic_file': self.status.intrinsic_file,
-            'extrinsic_file': self.status.extrinsic_file,
-            'dist_coeffs_file': self.status.dist_coeffs_file,
-            'working_dir': self.status.working_dir
-        }
+        """獲取標定狀態 - 狀態未變化時返回快取字典 (呼叫端僅作序列化，不得修改)"""
+        status = self.status
+        key = (status.intrinsic_loaded, status.extrinsic_loaded, status.transformer_valid,
+               status.intrinsic_file, status.extrinsic_file, status.dist_coeffs_file,
+               status.working_dir)
+        if key != self._status_key:
+            self._status_dict = {
+                'intrinsic_loaded': status.intrinsic_loaded,
+                'extrinsic_loaded': status.extrinsic_loaded,
+                'transformer_valid': status.transformer_valid,
+                'intrinsic_file': status.intrinsic_file,
+                'extrinsic_file': status.extrinsic_file,
+                'dist_coeffs_file': status.dist_coeffs_file,
+                'working_dir': status.working_dir
+            }
+            self._status_key = key
+        return self._status_dict
 
 
 # ==================== 狀態機 ====================
 class SystemStateMachine:
-    """系統狀態機"""
+    """系統狀態機
+    
+    status_register整數的讀取與替換在CPython中為單一原子操作，讀取路徑不需加鎖；
+    寫入為讀-改-寫，仍以鎖保證多個指令線程同時設置不同位元時不會互相覆蓋
+    """
     
     def __init__(self):
         self.lock = threading.Lock()
         self.status_register = 0b0001  # 初始Ready=1
     
     def get_bit(self, bit_pos: StatusBits) -> bool:
-        """獲取狀態位"""
-        with self.lock:
-            return bool(self.status_register & (1 << bit_pos))
+        """獲取狀態位 (無鎖讀取)"""
+        return bool(self.status_register & (1 << bit_pos))
     
     def set_bit(self, bit_pos: StatusBits, value: bool):
         """設置狀態位"""
+        mask = 1 << bit_pos
+        # 位元已是目標值時直接返回，不取鎖
+        if bool(self.status_register & mask) == value:
+            return
         with self.lock:
             if value:
-                self.status_register |= (1 << bit_pos)
+                self.status_register |= mask
             else:
-                self.status_register &= ~(1 << bit_pos)
+                self.status_register &= ~mask
     
     def is_ready(self) -> bool:
         return self.get_bit(StatusBits.READY)
@@ -854,9 +1457,57 @@ class SystemStateMachine:
 
 
 # ==================== Modbus TCP Client服務 ====================
+_I32_MIN = -2 ** 31
+_I32_MAX = 2 ** 31 - 1
+
+
+def _clamp_i32(value: int) -> int:
+    """限制在有號32位整數範圍內 (struct打包'i'超出範圍會拋出struct.error)"""
+    return _I32_MIN if value < _I32_MIN else _I32_MAX if value > _I32_MAX else value
+
+
+def _i32_words(values: List[int]) -> Tuple[int, ...]:
+    """將有號32位整數序列拆為(高16位, 低16位)寄存器字序列 - 以struct一次完成，負數為補碼
+    
+    佈局與pymodbus convert_to_registers(v, DATATYPE.INT32, word_order='big')相同；
+    超出int32範圍的值先飽和到邊界，不拋出異常
+    """
+    n = len(values)
+    return struct.unpack(f'>{n * 2}H', struct.pack(f'>{n}i', *map(_clamp_i32, values)))
+
+
+def _words_i32(words: List[int]) -> Tuple[int, ...]:
+    """_i32_words的反向操作：(高16位, 低16位)寄存器字序列還原為有號32位整數"""
+    n = len(words) // 2
+    return struct.unpack(f'>{n}i', struct.pack(f'>{n * 2}H', *words))
+
+
+# 世界座標寄存器區塊 (261-280)：5個目標×(X, Y)的有號32位整數 ↔ 20個寄存器字
+_WORLD_I32 = struct.Struct('>10i')
+_WORLD_U16 = struct.Struct('>20H')
+
+
+def _merge_register_runs(pairs: List[Tuple[int, int]]) -> List[Tuple[int, List[int]]]:
+    """將已排序的(地址, 值)合併為連續地址段 [(起始地址, [值...]), ...]"""
+    runs = []
+    for address, value in pairs:
+        if runs and address == runs[-1][0] + len(runs[-1][1]):
+            runs[-1][1].append(value)
+        else:
+            runs.append((address, [value]))
+    return runs
+
+
 class EnhancedModbusTcpClientService:
     """增強版Modbus TCP Client服務 - YOLOv11版本"""
     
+    # 指令失敗時寫入ERROR_CODE的錯誤代碼
+    _CMD_ERROR = {
+        ControlCommand.CAPTURE: 10,          # 拍照錯誤
+        ControlCommand.CAPTURE_DETECT: 20,   # 檢測錯誤
+        ControlCommand.INITIALIZE: 30,       # 初始化錯誤
+    }
+    
     def __init__(self, server_ip="127.0.0.1", server_port=502):
         self.server_ip = server_ip
         self.server_port = server_port
@@ -868,88 +1519,14 @@ class EnhancedModbusTcpClientService:
         self.sync_thread = None
         self.sync_running = False
         self.sync_interval = 0.05  # 50ms輪詢
+        self._stop_event = threading.Event()  # 停止信號，兼作輪詢時鐘 (set後wait立即返回)
         
-        # CCD1 Modbus寄存器映射 (基地址200) - YOLOv11版本
-        self.REGISTERS = {
-            # 控制寄存器 (200-201)
-            'CONTROL_COMMAND': 200,        # 控制指令
-            'STATUS_REGISTER': 201,        # 狀態寄存器
-            
-            # 模型管理寄存器 (202)
-            'MODEL_SELECT': 202,           # 模型選擇 (0=未指定, 1-20=模型ID)
-            
-            # 完成標誌寄存器 (203-206)
-            'CAPTURE_COMPLETE': 203,       # 拍照完成標誌
-            'DETECT_COMPLETE': 204,        # 檢測完成標誌
-            'OPERATION_SUCCESS': 205,      # 操作成功標誌
-            'ERROR_CODE': 206,             # 錯誤代碼
-            
-            # YOLOv11檢測參數寄存器 (210-219)
-            'CONFIDENCE_HIGH': 210,        # 置信度閾值高位
-            'CONFIDENCE_LOW': 211,         # 置信度閾值低位
-            'RESERVED_212': 212,
-            'RESERVED_213': 213,
-            'RESERVED_214': 214,
-            'RESERVED_215': 215,
-            
-            # YOLOv11檢測結果寄存器 (240-259) - 方案A
-            'DR_F_COUNT': 240,           # DR_F檢測數量
-            'STACK_COUNT': 242,            # STACK檢測數量 (新增)
-            'TOTAL_DETECTIONS': 243,       # 總檢測數量
-            'DETECTION_SUCCESS': 244,      # 檢測成功標誌
-            
-            # DR_F座標寄存器 (245-254) - 最多5個
-            'DR_F_1_X': 245,
-            'DR_F_1_Y': 246,
-            'DR_F_2_X': 247,
-            'DR_F_2_Y': 248,
-            'DR_F_3_X': 249,
-            'DR_F_3_Y': 250,
-            'DR_F_4_X': 251,
-            'DR_F_4_Y': 252,
-            'DR_F_5_X': 253,
-            'DR_F_5_Y': 254,
-
-            'STACK_1_X': 257,             # STACK第1個座標X
-            'STACK_1_Y': 258,             # STACK第1個座標Y
-            'MODEL_ID_USED': 259,         # 本次檢測使用的模型ID
-            
-            # 世界座標寄存器 (260-279) - 保持不變
-            'WORLD_COORD_VALID': 260,
-            'DR_F_1_WORLD_X_HIGH': 261,
-            'DR_F_1_WORLD_X_LOW': 262,
-            'DR_F_1_WORLD_Y_HIGH': 263,
-            'DR_F_1_WORLD_Y_LOW': 264,
-            'DR_F_2_WORLD_X_HIGH': 265,
-            'DR_F_2_WORLD_X_LOW': 266,
-            'DR_F_2_WORLD_Y_HIGH': 267,
-            'DR_F_2_WORLD_Y_LOW': 268,
-            'DR_F_3_WORLD_X_HIGH': 269,
-            'DR_F_3_WORLD_X_LOW': 270,
-            'DR_F_3_WORLD_Y_HIGH': 271,
-            'DR_F_3_WORLD_Y_LOW': 272,
-            'DR_F_4_WORLD_X_HIGH': 273,
-            'DR_F_4_WORLD_X_LOW': 274,
-            'DR_F_4_WORLD_Y_HIGH': 275,
-            'DR_F_4_WORLD_Y_LOW': 276,
-            'DR_F_5_WORLD_X_HIGH': 277,
-            'DR_F_5_WORLD_X_LOW': 278,
-            'DR_F_5_WORLD_Y_HIGH': 279,
-            'DR_F_5_WORLD_Y_LOW': 280,
-            
-            # 統計資訊寄存器 (281-299)
-            'LAST_CAPTURE_TIME': 281,     # 最後拍照耗時
-            'LAST_PROCESS_TIME': 282,     # 最後處理耗時
-            'LAST_TOTAL_TIME': 283,       # 最後總耗時
-            'OPERATION_COUNT': 284,       # 操作計數器
-            'ERROR_COUNT': 285,           # 錯誤計數器
-            'CONNECTION_COUNT': 286,      # 連接計數器
-            'MODEL_SWITCH_COUNT': 287,    # 模型切換次數 (新增)
-            'VERSION_MAJOR': 290,         # 軟體版本主版號
-            'VERSION_MINOR': 291,         # 軟體版本次版號
-            'UPTIME_HOURS': 292,          # 系統運行時間 (小時)
-            'UPTIME_MINUTES': 293,        # 系統運行時間 (分鐘)
-        }
+        # 指令執行：單一常駐工作線程消費指令佇列，取代每條指令新建線程
+        self._cmd_queue: "queue.Queue[Optional[ControlCommand]]" = queue.Queue(maxsize=4)
+        self._cmd_worker: Optional[threading.Thread] = None
+        
+        # CCD1 Modbus寄存器映射 (名稱→地址)，供Web介面/除錯以名稱存取；熱路徑直接使用Reg常數
+        self.REGISTERS = {reg.name: int(reg) for reg in Reg}
         
         # 狀態追蹤
         self.last_control_command = 0
@@ -958,12 +1535,25 @@ class EnhancedModbusTcpClientService:
         self.error_count = 0
         self.connection_count = 0
         self.start_time = time.time()
+        self.start_time_ns = time.monotonic_ns()  # 運行時間計算用，不受系統時鐘調整影響
         # 握手狀態控制
         self.command_execution_time = 0     # 指令執行開始時間
         self.min_running_duration = 1.0     # 最小Running狀態持續時間(秒)
         self.completion_hold_time = 2.0     # 完成狀態保持時間(秒)
         self.completion_start_time = 0      # 完成狀態開始時間
         self.current_command = 0            # 當前執行的指令
+        
+        # 上次寫入PLC的值快照，未變化時跳過寫入
+        self._last_status = -1
+        self._last_statistics: Dict[int, int] = {}
+        self._last_switch_count = -1
+        
+        # 已與MODEL_SELECT同步的模型ID快取 (-1=未知)，相同時略過模型管理
+        self._current_model_id = -1
+        
+        # pymodbus同步Client非線程安全：同步循環、指令工作線程與Web API共用同一socket，
+        # 所有請求/回應交換須在此鎖內完成，避免幀交錯
+        self._io_lock = threading.RLock()
     def set_vision_controller(self, controller):
         """設置視覺控制器引用"""
         self.vision_controller = controller
@@ -975,30 +1565,45 @@ class EnhancedModbusTcpClientService:
             return False
         
         try:
-            if self.client:
-                self.client.close()
+            # 關閉/替換共用client須與其他線程的請求交換互斥 (同步循環與指令線程可能仍在運行)
+            with self._io_lock:
+                if self.client:
+                    self.client.close()
             
-            print(f"🔗 正在連接Modbus TCP服務器: {self.server_ip}:{self.server_port}")
+                print(f"🔗 正在連接Modbus TCP服務器: {self.server_ip}:{self.server_port}")
             
-            self.client = ModbusTcpClient(
-                host=self.server_ip,
-                port=self.server_port,
-                timeout=3.0
-            )
+                self.client = ModbusTcpClient(
+                    host=self.server_ip,
+                    port=self.server_port,
+                    timeout=3.0
+                )
             
-            if self.client.connect():
-                self.connected = True
-                self.connection_count += 1
+                if self.client.connect():
+                    self.connected = True
+                    self.connection_count += 1
                 
-                # 寫入初始狀態
-                self._write_initial_status()
+                    # 關閉Nagle演算法：短小的請求/回應交替時，Nagle與延遲ACK疊加會讓每次呼叫多等數十ms
+                    sock = getattr(self.client, 'socket', None)
+                    if sock is not None:
+                        try:
+                            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                        except OSError:
+                            pass
                 
-                print(f"✅ Modbus TCP Client連接成功: {self.server_ip}:{self.server_port}")
-                return True
-            else:
-                print(f"❌ Modbus TCP連接失敗: {self.server_ip}:{self.server_port}")
-                self.connected = False
-                return False
+                    # 新連線後PLC端的值未知，清除快照強制重寫
+                    self._last_status = -1
+                    self._last_statistics = {}
+                    self._last_switch_count = -1
+                
+                    # 寫入初始狀態
+                    self._write_initial_status()
+                
+                    print(f"✅ Modbus TCP Client連接成功: {self.server_ip}:{self.server_port}")
+                    return True
+                else:
+                    print(f"❌ Modbus TCP連接失敗: {self.server_ip}:{self.server_port}")
+                    self.connected = False
+                    return False
                 
         except Exception as e:
             print(f"❌ Modbus TCP連接異常: {e}")
@@ -1009,48 +1614,63 @@ class EnhancedModbusTcpClientService:
         """斷開Modbus連接"""
         self.stop_sync()
         
-        if self.client and self.connected:
-            try:
-                # 寫入斷線狀態
-                self.write_register('STATUS_REGISTER', 0)
-                self.client.close()
-                print("🔌 Modbus TCP Client已斷開連接")
-            except:
-                pass
+        # 關閉與清除client在I/O鎖內完成，其他線程的請求交換不會用到半關閉的client
+        with self._io_lock:
+            if self.client and self.connected:
+                try:
+                    # 寫入斷線狀態
+                    self._wr(Reg.STATUS_REGISTER, 0)
+                    self.client.close()
+                    print("🔌 Modbus TCP Client已斷開連接")
+                except:
+                    pass
+            
+            self.connected = False
+            self.client = None
+    def _handle_model_management(self, model_select: Optional[int] = None):
+        """處理模型管理指令
         
-        self.connected = False
-        self.client = None
-    def _handle_model_management(self):
-        """處理模型管理指令"""
+        Args:
+            model_select: 已讀取的MODEL_SELECT值，None時自行讀取
+        """
         try:
+            # 讀取模型選擇寄存器
+            if model_select is None:
+                model_select = self._rd(Reg.MODEL_SELECT)
+            
+            # 穩態快速路徑：與已同步的模型相同時不觸碰控制器
+            if model_select is None or model_select == self._current_model_id:
+                return
+            
             if not self.vision_controller or not self.vision_controller.yolo_detector:
                 return
             
-            # 讀取模型選擇寄存器
-            model_select = self.read_register('MODEL_SELECT')
-            if model_select is None:
+            model_manager = self.vision_controller.yolo_detector.model_manager
+            current_model_id = model_manager.current_model_id
+            
+            # 檢查是否需要切換模型 (Web介面切換後會同步寫入MODEL_SELECT，此時僅更新快取)
+            if model_select == current_model_id:
+                self._current_model_id = current_model_id
                 return
             
-            current_model_id = self.vision_controller.yolo_detector.model_manager.current_model_id
+            print(f"📋 收到模型切換指令: 模型{current_model_id} → 模型{model_select}")
             
-            # 檢查是否需要切換模型
-            if model_select != current_model_id:
-                print(f"📋 收到模型切換指令: 模型{current_model_id} → 模型{model_select}")
+            if 0 <= model_select <= 20:
+                success = self.vision_controller.yolo_detector.switch_model(model_select)
                 
-                if 0 <= model_select <= 20:
-                    success = self.vision_controller.yolo_detector.switch_model(model_select)
-                    
-                    if success:
-                        print(f"✅ 模型切換成功: 當前模型{model_select}")
-                        # 更新模型切換計數
-                        switch_count = self.vision_controller.yolo_detector.model_manager.model_switch_count
-                        self.write_register('MODEL_SWITCH_COUNT', switch_count)
-                    else:
-                        print(f"❌ 模型切換失敗: 模型{model_select}")
-                        self.write_register('ERROR_CODE', 10)  # 模型切換錯誤
+                if success:
+                    print(f"✅ 模型切換成功: 當前模型{model_select}")
+                    self._current_model_id = model_select
+                    # 更新模型切換計數 (僅在變化時寫入)
+                    switch_count = model_manager.model_switch_count
+                    if switch_count != self._last_switch_count and self._wr(Reg.MODEL_SWITCH_COUNT, switch_count):
+                        self._last_switch_count = switch_count
                 else:
-                    print(f"❌ 無效的模型ID: {model_select}")
-                    self.write_register('ERROR_CODE', 11)  # 無效模型ID錯誤
+                    print(f"❌ 模型切換失敗: 模型{model_select}")
+                    self._wr(Reg.ERROR_CODE, 10)  # 模型切換錯誤
+            else:
+                print(f"❌ 無效的模型ID: {model_select}")
+                self._wr(Reg.ERROR_CODE, 11)  # 無效模型ID錯誤
                     
         except Exception as e:
             print(f"❌ 處理模型管理指令失敗: {e}")
@@ -1059,7 +1679,11 @@ class EnhancedModbusTcpClientService:
         if self.sync_running:
             return
         
+        self._stop_event.clear()
         self.sync_running = True
+        if self._cmd_worker is None or not self._cmd_worker.is_alive():
+            self._cmd_worker = threading.Thread(target=self._command_worker, daemon=True)
+            self._cmd_worker.start()
         self.sync_thread = threading.Thread(target=self._handshake_sync_loop, daemon=True)
         self.sync_thread.start()
         print("✅ Modbus握手同步線程已啟動")
@@ -1068,48 +1692,25 @@ class EnhancedModbusTcpClientService:
         """停止同步線程"""
         if self.sync_running:
             self.sync_running = False
+            self._stop_event.set()
             if self.sync_thread and self.sync_thread.is_alive():
                 self.sync_thread.join(timeout=2.0)
+            # 通知指令工作線程在當前指令完成後退出
+            try:
+                self._cmd_queue.put_nowait(None)
+            except queue.Full:
+                pass
             print("🛑 Modbus握手同步線程已停止")
     
-    def _handshake_sync_loop(self):
-        """握手同步循環 - 50ms高頻輪詢"""
-        """握手同步循環 - 修正版"""
-        print("🔄 增強版握手同步線程開始運行...")
-        
-        while self.sync_running and self.connected:
-            try:
-                # 1. 更新狀態寄存器到PLC
-                self._update_status_register()
-                
-                # 2. 讀取控制指令並處理握手邏輯
-                self._handle_control_command_enhanced()
-                
-                # 3. 處理完成狀態邏輯
-                self._handle_completion_status()
-                
-                # 4. 更新統計資訊
-                self._update_statistics()
-                
-                # 短暫休眠
-                time.sleep(self.sync_interval)
-                
-            except ConnectionException:
-                print("❌ Modbus連接中斷，同步線程退出")
-                self.connected = False
-                break
-                
-            except Exception as e:
-                print(f"❌ 同步線程錯誤: {e}")
-                self.error_count += 1
-                time.sleep(1.0)
+    def _handle_control_command_enhanced(self, current_command: Optional[int] = None):
+        """處理控制指令握手邏輯 - 增強版
         
-        self.sync_running = False
-        print("⏹️ 增強版同步線程已退出")
-    def _handle_control_command_enhanced(self):
-        """處理控制指令握手邏輯 - 增強版"""
+        Args:
+            current_command: 已讀取的CONTROL_COMMAND值，None時自行讀取
+        """
         try:
-            current_command = self.read_register('CONTROL_COMMAND')
+            if current_command is None:
+                current_command = self._rd(Reg.CONTROL_COMMAND)
             if current_command is None:
                 return
             
@@ -1127,44 +1728,76 @@ class EnhancedModbusTcpClientService:
                 # 清除完成標誌
                 self._clear_completion_flags()
                 
-                # 異步執行指令
-                command_thread = threading.Thread(
-                    target=self._execute_command_enhanced, 
-                    args=(ControlCommand(current_command),),
-                    daemon=True
-                )
-                command_thread.start()
+                # 交由指令工作線程異步執行
+                try:
+                    self._cmd_queue.put_nowait(ControlCommand(current_command))
+                except queue.Full:
+                    print(f"⚠️ 指令佇列已滿，忽略指令: {current_command}")
+                    self.command_processing = False
                 
             # 處理指令清零邏輯
             elif current_command == 0 and self.last_control_command != 0:
-                print(f"📋 控制指令已清零，準備恢復Ready狀態")
+                logger.debug("控制指令已清零，準備恢復Ready狀態")
                 self._handle_command_clear()
                 
         except Exception as e:
             print(f"❌ 處理控制指令失敗: {e}")
+    
+    def _command_worker(self):
+        """指令工作線程 - 依序執行佇列中的控制指令，同步已停止時收到None即退出"""
+        while True:
+            command = self._cmd_queue.get()
+            if command is None:
+                # 停止後又重新啟動時，遺留的退出信號直接忽略
+                if self._stop_event.is_set():
+                    break
+                continue
+            try:
+                self._execute_command_enhanced(command)
+            except Exception as e:
+                print(f"❌ 指令工作線程錯誤: {e}")
+                self.command_processing = False
     def _handshake_sync_loop(self):
-        """握手同步循環 - 修正版"""
+        """握手同步循環 - 50ms高頻輪詢"""
         print("🔄 增強版握手同步線程開始運行...")
         
-        while self.sync_running and self.connected:
+        # 迴圈不變量提升為區域變數
+        ctrl_addr = Reg.CONTROL_COMMAND
+        read_range = self.read_range
+        wait = self._stop_event.wait
+        interval = self.sync_interval
+        
+        while not self._stop_event.is_set() and self.connected:
             try:
                 # 1. 更新狀態寄存器到PLC
                 self._update_status_register()
                 
+                # 一次讀取200-206 (控制指令/狀態/模型選擇/完成標誌)，取代每tick多次單獨讀取
+                # read_range吞掉網路異常並返回None：短暫斷線只略過本輪，不結束同步線程
+                registers = read_range(ctrl_addr, 7)
+                if registers is None:
+                    self._update_statistics()
+                    if wait(interval):
+                        break
+                    continue
+                control_command = registers[0]
+                model_select = registers[2]
+                
                 # 2. 處理模型管理指令 (新增)
-                self._handle_model_management()
+                self._handle_model_management(model_select)
                 
-                # 3. 讀取控制指令並處理握手邏輯
-                self._handle_control_command_enhanced()
+                # 3. 處理控制指令握手邏輯
+                self._handle_control_command_enhanced(control_command)
                 
                 # 4. 處理完成狀態邏輯
-                self._handle_completion_status()
+                self._handle_completion_status(control_command)
                 
                 # 5. 更新統計資訊
                 self._update_statistics()
                 
-                # 短暫休眠
-                time.sleep(self.sync_interval)
+                # 短暫休眠 (收到停止信號時立即結束)
+                if wait(interval):
+                    break
                 
             except ConnectionException:
                 print("❌ Modbus連接中斷，同步線程退出")
@@ -1174,7 +1807,8 @@ class EnhancedModbusTcpClientService:
             except Exception as e:
                 print(f"❌ 同步線程錯誤: {e}")
                 self.error_count += 1
-                time.sleep(1.0)
+                if wait(1.0):
+                    break
         
         self.sync_running = False
         print("⏹️ 增強版同步線程已退出")
@@ -1183,7 +1817,10 @@ class EnhancedModbusTcpClientService:
         try:
             if self.vision_controller:
                 status_value = self.vision_controller.state_machine.status_register
-                self.write_register('STATUS_REGISTER', status_value)
+                if status_value == self._last_status:
+                    return
+                if self._wr(Reg.STATUS_REGISTER, status_value):
+                    self._last_status = status_value
         except:
             pass
     def _execute_command_enhanced(self, command: ControlCommand):
@@ -1205,7 +1842,7 @@ class EnhancedModbusTcpClientService:
             # 設置Running狀態，清除Ready
             self.vision_controller.state_machine.set_running(True)
             self.vision_controller.state_machine.set_ready(False)
-            print(f"🔄 狀態變更: Ready=0, Running=1")
+            logger.debug("狀態變更: Ready=0, Running=1")
             
             # 確保Running狀態持續足夠時間讓外部系統看到
             running_start = time.time()
@@ -1226,7 +1863,7 @@ class EnhancedModbusTcpClientService:
             running_duration = time.time() - running_start
             if running_duration < self.min_running_duration:
                 remaining_time = self.min_running_duration - running_duration
-                print(f"⏱️ Running狀態延長 {remaining_time:.2f} 秒以確保可見性")
+                logger.debug("Running狀態延長 %.2f 秒以確保可見性", remaining_time)
                 time.sleep(remaining_time)
             
             # 設置完成狀態
@@ -1247,26 +1884,31 @@ class EnhancedModbusTcpClientService:
             self.vision_controller.state_machine.set_running(False)
             self.command_processing = False
             self.completion_start_time = time.time()
-            print(f"🔄 狀態變更: Running=0, 等待指令清零後恢復Ready")
+            logger.debug("狀態變更: Running=0, 等待指令清零後恢復Ready")
     def _set_error_state(self, error_code: int, error_msg: str):
         """設置錯誤狀態"""
         try:
             print(f"❌ 設置錯誤狀態: {error_code} - {error_msg}")
-            self.write_register('ERROR_CODE', error_code)
-            self.write_register('OPERATION_SUCCESS', 0)
+            self.write_registers_batch({Reg.OPERATION_SUCCESS: 0, Reg.ERROR_CODE: error_code})
             self.vision_controller.state_machine.set_alarm(True)
             self.vision_controller.state_machine.set_running(False)
             self.command_processing = False
         except Exception as e:
             print(f"❌ 設置錯誤狀態失敗: {e}")
     def get_completion_status(self) -> Dict[str, Any]:
-        """獲取完成狀態"""
+        """獲取完成狀態 - 203-206一次批次讀取"""
         try:
+            capture_complete = detect_complete = operation_success = error_code = 0
+            if self.connected and self.client:
+                with self._io_lock:
+                    rr = self.client.read_holding_registers(Reg.CAPTURE_COMPLETE, count=4, slave=1)
+                if not rr.isError():
+                    capture_complete, detect_complete, operation_success, error_code = rr.registers[:4]
             return {
-                'capture_complete': self.read_register('CAPTURE_COMPLETE') or 0,
-                'detect_complete': self.read_register('DETECT_COMPLETE') or 0,
-                'operation_success': self.read_register('OPERATION_SUCCESS') or 0,
-                'error_code': self.read_register('ERROR_CODE') or 0,
+                'capture_complete': capture_complete,
+                'detect_complete': detect_complete,
+                'operation_success': operation_success,
+                'error_code': error_code,
                 'current_command': self.current_command
             }
         except:
@@ -1277,25 +1919,25 @@ class EnhancedModbusTcpClientService:
                 'error_code': 0,
                 'current_command': 0
             }
-    def _handle_completion_status(self):
-        """處理完成狀態邏輯"""
+    def _handle_completion_status(self, current_command: int):
+        """處理完成狀態邏輯
+        
+        Args:
+            current_command: 同步循環本輪已讀取的CONTROL_COMMAND值
+        """
         try:
-            # 如果有完成狀態且超過保持時間，自動清除某些標誌
-            if (self.completion_start_time > 0 and 
+            # 完成狀態超過保持時間且控制指令已清零時，準備下一次操作
+            if (self.completion_start_time > 0 and current_command == 0 and
                 time.time() - self.completion_start_time > self.completion_hold_time):
-                
-                # 檢查控制指令是否已清零
-                current_command = self.read_register('CONTROL_COMMAND')
-                if current_command == 0:
-                    print("⏰ 完成狀態保持時間結束，準備下一次操作")
-                    self.completion_start_time = 0
+                logger.debug("完成狀態保持時間結束，準備下一次操作")
+                self.completion_start_time = 0
                     
         except Exception as e:
             print(f"❌ 處理完成狀態失敗: {e}")
     def _handle_command_clear(self):
         """處理指令清零"""
         try:
-            print("🔄 處理指令清零，恢復Ready狀態")
+            logger.debug("處理指令清零，恢復Ready狀態")
             
             # 重置指令追蹤
             self.last_control_command = 0
@@ -1304,7 +1946,7 @@ class EnhancedModbusTcpClientService:
             # 如果沒有Alarm，恢復Ready狀態
             if not self.vision_controller.state_machine.is_alarm():
                 self.vision_controller.state_machine.set_ready(True)
-                print("✅ Ready狀態已恢復")
+                logger.debug("Ready狀態已恢復")
             else:
                 print("⚠️ 系統處於Alarm狀態，需要重置才能恢復Ready")
                 
@@ -1319,8 +1961,8 @@ class EnhancedModbusTcpClientService:
             if result and result.success:
                 # 更新檢測結果到PLC
                 self.update_detection_results(result)
-                self.write_register('CAPTURE_COMPLETE', 1)
-                self.write_register('DETECT_COMPLETE', 1)
+                # 完成標誌在結果之後單獨一次寫入 (203-204)，確保PLC看到完成時結果已就緒
+                self.write_registers_batch({Reg.CAPTURE_COMPLETE: 1, Reg.DETECT_COMPLETE: 1})
                 print(f"✅ YOLOv11檢測成功，DR_F={result.dr_f_count}")
                 return True
             else:
@@ -1329,24 +1971,26 @@ class EnhancedModbusTcpClientService:
                 self.error_count += 1
                 # 清空檢測結果
                 self._clear_detection_results()
-                self.write_register('CAPTURE_COMPLETE', 0)
-                self.write_register('DETECT_COMPLETE', 0)
+                self.write_registers_batch({Reg.CAPTURE_COMPLETE: 0, Reg.DETECT_COMPLETE: 0})
                 return False
                 
         except Exception as e:
             print(f"❌ 檢測指令執行失敗: {e}")
             self.error_count += 1
             self._clear_detection_results()
-            self.write_register('CAPTURE_COMPLETE', 0)
-            self.write_register('DETECT_COMPLETE', 0)
+            self.write_registers_batch({Reg.CAPTURE_COMPLETE: 0, Reg.DETECT_COMPLETE: 0})
             return False
     def _clear_completion_flags(self):
-        """清除完成標誌"""
+        """清除完成標誌 (203-206為連續地址，一次寫入)"""
+        if not self.connected or not self.client:
+            return
         try:
-            self.write_register('CAPTURE_COMPLETE', 0)
-            self.write_register('DETECT_COMPLETE', 0)
-            self.write_register('OPERATION_SUCCESS', 0)
-            self.write_register('ERROR_CODE', 0)
+            self.write_registers_batch({
+                Reg.CAPTURE_COMPLETE: 0,
+                Reg.DETECT_COMPLETE: 0,
+                Reg.OPERATION_SUCCESS: 0,
+                Reg.ERROR_CODE: 0,
+            })
         except Exception as e:
             print(f"❌ 清除完成標誌失敗: {e}")
     def _handle_initialize_command_enhanced(self):
@@ -1377,23 +2021,15 @@ class EnhancedModbusTcpClientService:
     def _set_completion_state(self, success: bool, command: ControlCommand):
         """設置完成狀態"""
         try:
-            self.write_register('OPERATION_SUCCESS', 1 if success else 0)
+            # 205-206連續地址，成功標誌與錯誤代碼一次寫入；成功時不設置Alarm
+            error_code = 0 if success else self._CMD_ERROR.get(command, 0)
+            self.write_registers_batch({
+                Reg.OPERATION_SUCCESS: 1 if success else 0,
+                Reg.ERROR_CODE: error_code,
+            })
             
             if not success:
-                # 設置錯誤代碼
-                error_code = 0
-                if command == ControlCommand.CAPTURE:
-                    error_code = 10  # 拍照錯誤
-                elif command == ControlCommand.CAPTURE_DETECT:
-                    error_code = 20  # 檢測錯誤
-                elif command == ControlCommand.INITIALIZE:
-                    error_code = 30  # 初始化錯誤
-                
-                self.write_register('ERROR_CODE', error_code)
                 self.vision_controller.state_machine.set_alarm(True)
-            else:
-                self.write_register('ERROR_CODE', 0)
-                # 成功時不設置Alarm
                 
         except Exception as e:
             print(f"❌ 設置完成狀態失敗: {e}")
@@ -1404,25 +2040,25 @@ class EnhancedModbusTcpClientService:
             image, capture_time = self.vision_controller.capture_image()
             
             if image is not None:
-                self.write_register('LAST_CAPTURE_TIME', int(capture_time * 1000))
-                self.write_register('CAPTURE_COMPLETE', 1)
+                self._wr(Reg.LAST_CAPTURE_TIME, int(capture_time * 1000))
+                self._wr(Reg.CAPTURE_COMPLETE, 1)
                 print(f"✅ 拍照成功，耗時: {capture_time*1000:.2f}ms")
                 return True
             else:
                 print("❌ 拍照失敗")
                 self.error_count += 1
-                self.write_register('CAPTURE_COMPLETE', 0)
+                self._wr(Reg.CAPTURE_COMPLETE, 0)
                 return False
                 
         except Exception as e:
             print(f"❌ 拍照指令執行失敗: {e}")
             self.error_count += 1
-            self.write_register('CAPTURE_COMPLETE', 0)
+            self._wr(Reg.CAPTURE_COMPLETE, 0)
             return False
     def _handle_control_command(self):
         """處理控制指令握手邏輯"""
         try:
-            current_command = self.read_register('CONTROL_COMMAND')
+            current_command = self._rd(Reg.CONTROL_COMMAND)
             if current_command is None:
                 return
             
@@ -1491,7 +2127,7 @@ class EnhancedModbusTcpClientService:
             image, capture_time = self.vision_controller.capture_image()
             
             if image is not None:
-                self.write_register('LAST_CAPTURE_TIME', int(capture_time * 1000))
+                self._wr(Reg.LAST_CAPTURE_TIME, int(capture_time * 1000))
                 print(f"✅ 拍照成功，耗時: {capture_time*1000:.2f}ms")
             else:
                 print("❌ 拍照失敗")
@@ -1547,190 +2183,120 @@ class EnhancedModbusTcpClientService:
     
     def _clear_detection_results(self):
         """清空檢測結果寄存器"""
+        if not self.connected or not self.client:
+            return
         try:
-            self.write_register('DR_F_COUNT', 0)
+            values = {
+                Reg.DR_F_COUNT: 0,
+                Reg.TOTAL_DETECTIONS: 0,
+                Reg.DETECTION_SUCCESS: 0,
+            }
             
-            self.write_register('TOTAL_DETECTIONS', 0)
-            self.write_register('DETECTION_SUCCESS', 0)
+            # 清空DR_F座標 (245-254)
+            values.update(dict.fromkeys(range(Reg.DR_F_1_X, Reg.DR_F_1_X + 10), 0))
             
-            # 清空DR_F座標
-            for i in range(1, 6):
-                self.write_register(f'DR_F_{i}_X', 0)
-                self.write_register(f'DR_F_{i}_Y', 0)
+            self.write_registers_batch(values)
                 
         except Exception as e:
             print(f"❌ 清空檢測結果失敗: {e}")
     
     def update_detection_results(self, result: YOLODetectionResult):
-        """更新YOLOv11檢測結果到PLC"""
+        """更新YOLOv11檢測結果到PLC - 收集全部寄存器值後合併連續地址批次寫入"""
+        # 未連接時直接返回，避免組裝寄存器值與座標轉換的開銷
+        if not self.connected or not self.client:
+            return
         try:
             # 寫入檢測數量 (包含STACK)
-            self.write_register('DR_F_COUNT', result.dr_f_count)
-            
-            self.write_register('STACK_COUNT', result.stack_count)  # 新增
-            self.write_register('TOTAL_DETECTIONS', result.total_detections)
-            self.write_register('DETECTION_SUCCESS', 1 if result.success else 0)
-            self.write_register('MODEL_ID_USED', result.model_id_used)  # 新增
-            
-            # 加入檢測數量寫入的打印訊息
-            print(f"📊 檢測數量寫入寄存器:")
-            print(f"   240(DR_F_COUNT) = {result.dr_f_count}")
+            values = {
+                Reg.DR_F_COUNT: result.dr_f_count,
+                Reg.STACK_COUNT: result.stack_count,  # 新增
+                Reg.TOTAL_DETECTIONS: result.total_detections,
+                Reg.DETECTION_SUCCESS: 1 if result.success else 0,
+                Reg.MODEL_ID_USED: result.model_id_used,  # 新增
+                # 保留位寫0，使240-283成為單一連續區段，一次write_registers送出
+                Reg.RESERVED_241: 0,
+                Reg.RESERVED_255: 0,
+                Reg.RESERVED_256: 0,
+            }
             
-            print(f"   242(STACK_COUNT) = {result.stack_count}")  # 新增
-            print(f"   243(TOTAL_DETECTIONS) = {result.total_detections}")
-            print(f"   244(DETECTION_SUCCESS) = {1 if result.success else 0}")
-            print(f"   259(MODEL_ID_USED) = {result.model_id_used}")  # 新增
-
             # 寫入DR_F座標 (最多5個) - 地址更新為245-254
-            for i in range(5):
-                if i < len(result.dr_f_coords):
-                    x, y = result.dr_f_coords[i]
-                    self.write_register(f'DR_F_{i+1}_X', int(float(x)))
-                    self.write_register(f'DR_F_{i+1}_Y', int(float(y)))
-                    print(f"   {245+i*2}(DR_F_{i+1}_X) = {int(float(x))}")
-                    print(f"   {246+i*2}(DR_F_{i+1}_Y) = {int(float(y))}")
-                else:
-                    self.write_register(f'DR_F_{i+1}_X', 0)
-                    self.write_register(f'CDR_F_{i+1}_Y', 0)
+            # 座標來源已為Python float (檢測器以tolist()輸出)，四捨五入到整數像素
+            # 固定10格預填0，未使用的槽位自然清零
+            flat = [0] * 10
+            for i, (x, y) in enumerate(result.dr_f_coords[:5]):
+                flat[2 * i] = int(round(x))
+                flat[2 * i + 1] = int(round(y))
+            values.update(zip(range(Reg.DR_F_1_X, Reg.DR_F_1_X + 10), flat))
             
             if result.stack_coords:
                 x, y = result.stack_coords[0]
-                self.write_register('STACK_1_X', int(float(x)))
-                self.write_register('STACK_1_Y', int(float(y)))
-                print(f"   257(STACK_1_X) = {int(float(x))}")
-                print(f"   258(STACK_1_Y) = {int(float(y))}")
+                values[Reg.STACK_1_X] = int(round(x))
+                values[Reg.STACK_1_Y] = int(round(y))
             else:
-                self.write_register('STACK_1_X', 0)
-                self.write_register('STACK_1_Y', 0)
+                values[Reg.STACK_1_X] = 0
+                values[Reg.STACK_1_Y] = 0
             
             # 寫入時間統計 - 確保為整數類型
-            self.write_register('LAST_CAPTURE_TIME', int(float(result.capture_time)))
-            self.write_register('LAST_PROCESS_TIME', int(float(result.processing_time)))
-            self.write_register('LAST_TOTAL_TIME', int(float(result.total_time)))
+            values[Reg.LAST_CAPTURE_TIME] = int(result.capture_time)
+            values[Reg.LAST_PROCESS_TIME] = int(result.processing_time)
+            values[Reg.LAST_TOTAL_TIME] = int(result.total_time)
+            
+            # 世界座標：檢測流程中_add_world_coordinates_yolo已依標定有效性轉換並填入結果，
+            # 此處直接以結果為準，不再重複檢查轉換器
+            world_coords = result.dr_f_world_coords if result.success else None
+            if world_coords:
+                values[Reg.WORLD_COORD_VALID] = 1
+                
+                # 寫入前5個世界座標 (×100存儲，參考原CCD1方式)
+                # 每個座標拆為(高位, 低位)，不足5個的以0補滿261-280
+                # 近奇異反投影可能得到極大值，先飽和到int32範圍，避免打包失敗丟棄整批結果
+                ints = [_clamp_i32(int(v * 100)) for xy in world_coords[:5] for v in xy]
+                ints += [0] * (10 - len(ints))
+                world_base = Reg.DR_F_1_WORLD_X_HIGH
+                values.update(zip(range(world_base, world_base + 20),
+                                  _WORLD_U16.unpack(_WORLD_I32.pack(*ints))))
+            else:
+                values[Reg.WORLD_COORD_VALID] = 0
             
-            # 世界座標轉換（如果可用）
-            if (result.success and result.dr_f_coords and
-                self.vision_controller and 
-                self.vision_controller.calibration_manager.transformer.is_valid()):
-                
-                world_coords = result.dr_f_world_coords
-                
+            # 寄存器明細僅在DEBUG層級組裝並一次輸出
+            if logger.isEnabledFor(logging.DEBUG):
+                lines = ["檢測結果寫入寄存器:"]
+                lines.extend(f"   {int(address)}({Reg(address).name}) = {value}"
+                             for address, value in sorted(values.items()))
                 if world_coords:
-                    self.write_register('WORLD_COORD_VALID', 1)
-                    print(f"🌍 世界座標轉換成功，共{len(world_coords)}個DR_F目標")
-                    
-                    # 寫入前5個世界座標 (×100存儲，參考原CCD1方式)
-                    # 修正世界座標寫入部分 - 在 update_detection_results 方法中
-
-                    # 寫入前5個世界座標 (×100存儲，參考原CCD1方式)
-                    for i in range(min(5, len(world_coords))):
-                        world_x, world_y = world_coords[i]
-                        
-                        # 轉換為32位整數並分高低位存儲（×100精度）
-                        world_x_int = int(float(world_x) * 100)
-                        world_y_int = int(float(world_y) * 100)
-                        
-                        print(f"   處理 DR_F {i+1}: 原始值=({world_x:.2f}, {world_y:.2f})")
-                        print(f"   ×100後整數值: x_int={world_x_int}, y_int={world_y_int}")
-                        
-                        # 🎯 修正：處理負數（使用補碼表示法）
-                        if world_x_int < 0:
-                            world_x_uint32 = (2**32) + world_x_int  # 轉換為無符號32位
-                        else:
-                            world_x_uint32 = world_x_int
-                            
-                        if world_y_int < 0:
-                            world_y_uint32 = (2**32) + world_y_int  # 轉換為無符號32位
-                        else:
-                            world_y_uint32 = world_y_int
-                        
-                        print(f"   32位無符號值: x_uint32={world_x_uint32}, y_uint32={world_y_uint32}")
-                        
-                        # 🎯 修正：正確分割32位為高16位和低16位
-                        world_x_high = (world_x_uint32 >> 16) & 0xFFFF  # 高16位
-                        world_x_low = world_x_uint32 & 0xFFFF           # 低16位
-                        world_y_high = (world_y_uint32 >> 16) & 0xFFFF  # 高16位
-                        world_y_low = world_y_uint32 & 0xFFFF           # 低16位
-                        
-                        print(f"   分割結果: x_high={world_x_high}, x_low={world_x_low}")
-                        print(f"   分割結果: y_high={world_y_high}, y_low={world_y_low}")
-                        
-                        # 🎯 驗證：重新組合檢查
-                        reconstructed_x = (world_x_high << 16) | world_x_low
-                        reconstructed_y = (world_y_high << 16) | world_y_low
-                        
-                        # 如果是負數，轉換回有符號整數
-                        if reconstructed_x >= 2**31:
-                            reconstructed_x_signed = reconstructed_x - 2**32
-                        else:
-                            reconstructed_x_signed = reconstructed_x
-                            
-                        if reconstructed_y >= 2**31:
-                            reconstructed_y_signed = reconstructed_y - 2**32
-                        else:
-                            reconstructed_y_signed = reconstructed_y
-                        
-                        reconstructed_x_mm = reconstructed_x_signed / 100.0
-                        reconstructed_y_mm = reconstructed_y_signed / 100.0
-                        
-                        print(f"   驗證重組: ({reconstructed_x_mm:.2f}, {reconstructed_y_mm:.2f}) mm")
-                        
-                        # 確保分割值在16位範圍內
-                        if world_x_high > 65535 or world_x_low > 65535 or world_y_high > 65535 or world_y_low > 65535:
-                            print(f"❌ 警告：分割值超出16位範圍！")
-                            print(f"   x_high={world_x_high}, x_low={world_x_low}")
-                            print(f"   y_high={world_y_high}, y_low={world_y_low}")
-                        
-                        # 寫入世界座標寄存器
-                        self.write_register(f'DR_F_{i+1}_WORLD_X_HIGH', world_x_high)
-                        self.write_register(f'DR_F_{i+1}_WORLD_X_LOW', world_x_low)
-                        self.write_register(f'DR_F_{i+1}_WORLD_Y_HIGH', world_y_high)
-                        self.write_register(f'DR_F_{i+1}_WORLD_Y_LOW', world_y_low)
-                        
-                        # 加入詳細的寄存器寫入打印訊息
-                        print(f"   DR_F {i+1} 世界座標寫入:")
-                        print(f"     {261+i*4}(WORLD_X_HIGH) = {world_x_high}")
-                        print(f"     {262+i*4}(WORLD_X_LOW) = {world_x_low}")
-                        print(f"     {263+i*4}(WORLD_Y_HIGH) = {world_y_high}")
-                        print(f"     {264+i*4}(WORLD_Y_LOW) = {world_y_low}")
-                        print(f"     實際值: ({world_x:.2f}, {world_y:.2f}) mm")
-                        print(f"     驗證值: ({reconstructed_x_mm:.2f}, {reconstructed_y_mm:.2f}) mm")
-                        print()  # 空行分隔
-                    
-                    print(f"✅ 共寫入{len(world_coords)}個DR_F世界座標到Modbus寄存器")
-                    
-                    # 清空未使用的世界座標寄存器
-                    for i in range(len(world_coords), 5):
-                        self.write_register(f'DR_F_{i+1}_WORLD_X_HIGH', 0)
-                        self.write_register(f'DR_F_{i+1}_WORLD_X_LOW', 0)
-                        self.write_register(f'DR_F_{i+1}_WORLD_Y_HIGH', 0)
-                        self.write_register(f'DR_F_{i+1}_WORLD_Y_LOW', 0)
-                else:
-                    print(f"❌ 世界座標轉換失敗")
-                    self.write_register('WORLD_COORD_VALID', 0)
-            else:
-                self.write_register('WORLD_COORD_VALID', 0)
+                    lines.extend(f"   DR_F {i+1} 世界座標: ({wx:.2f}, {wy:.2f}) mm"
+                                 for i, (wx, wy) in enumerate(world_coords[:5]))
+                logger.debug("\n".join(lines))
+            
+            if self.write_registers_batch(values) and world_coords:
+                print(f"✅ 共寫入{len(world_coords)}個DR_F世界座標到Modbus寄存器")
             
         except Exception as e:
             print(f"❌ 更新檢測結果到PLC失敗: {e}")
     
     def _update_statistics(self):
-        """更新統計資訊"""
-        try:
-            self.write_register('OPERATION_COUNT', self.operation_count)
-            self.write_register('ERROR_COUNT', self.error_count)
-            self.write_register('CONNECTION_COUNT', self.connection_count)
-            
-            # 更新運行時間
-            uptime_total_minutes = int((time.time() - self.start_time) / 60)
-            uptime_hours = uptime_total_minutes // 60
-            uptime_minutes = uptime_total_minutes % 60
-            
-            self.write_register('UPTIME_HOURS', uptime_hours)
-            self.write_register('UPTIME_MINUTES', uptime_minutes)
-            
-        except:
-            pass
+        """更新統計資訊 - 284-286與292-293兩段連續地址批次寫入
+        
+        Modbus錯誤由write_registers_batch處理 (返回False，下輪重試)；
+        其他異常不再吞掉，交由同步循環記錄並計入錯誤計數
+        """
+        # 更新運行時間 (整數奈秒，整數除法)
+        uptime_hours, uptime_minutes = divmod(
+            (time.monotonic_ns() - self.start_time_ns) // 60_000_000_000, 60)
+        
+        statistics = {
+            Reg.OPERATION_COUNT: self.operation_count,
+            Reg.ERROR_COUNT: self.error_count,
+            Reg.CONNECTION_COUNT: self.connection_count,
+            Reg.UPTIME_HOURS: uptime_hours,
+            Reg.UPTIME_MINUTES: uptime_minutes,
+        }
+        
+        # 只寫入有變化的值 (運行時間僅在分鐘進位時變化)
+        changed = {address: value for address, value in statistics.items()
+                   if self._last_statistics.get(address) != value}
+        if changed and self.write_registers_batch(changed):
+            self._last_statistics.update(changed)
     
     def _update_world_coord_status(self):
         """更新世界座標有效性狀態"""
@@ -1738,77 +2304,110 @@ class EnhancedModbusTcpClientService:
             if (self.vision_controller and 
                 self.vision_controller.calibration_manager.transformer.is_valid()):
                 # 如果標定數據有效但還沒設置標誌，設置為有效
-                current_status = self.read_register('WORLD_COORD_VALID')
+                current_status = self._rd(Reg.WORLD_COORD_VALID)
                 if current_status is None:
-                    self.write_register('WORLD_COORD_VALID', 0)
+                    self._wr(Reg.WORLD_COORD_VALID, 0)
             else:
-                self.write_register('WORLD_COORD_VALID', 0)
+                self._wr(Reg.WORLD_COORD_VALID, 0)
         except:
             pass
     
     def _write_initial_status(self):
         """寫入初始狀態到PLC"""
         try:
-            # 版本資訊
-            self.write_register('VERSION_MAJOR', 5)  # YOLOv11版本
-            self.write_register('VERSION_MINOR', 0)
-            
             # 初始化置信度閾值為0.8 (×10000存儲)
             confidence_int = int(0.8 * 10000)  # 8000
-            self.write_register('CONFIDENCE_HIGH', (confidence_int >> 16) & 0xFFFF)
-            self.write_register('CONFIDENCE_LOW', confidence_int & 0xFFFF)
-            
-            # 計數器
-            self.write_register('OPERATION_COUNT', self.operation_count)
-            self.write_register('ERROR_COUNT', self.error_count)
-            self.write_register('CONNECTION_COUNT', self.connection_count)
+            conf_high, conf_low = _i32_words([confidence_int])
+            
+            # 置信度(210-211)、計數器(284-286)、版本資訊(290-291) 合併批次寫入
+            self.write_registers_batch({
+                Reg.VERSION_MAJOR: 5,  # YOLOv11版本
+                Reg.VERSION_MINOR: 0,
+                Reg.CONFIDENCE_HIGH: conf_high,
+                Reg.CONFIDENCE_LOW: conf_low,
+                Reg.OPERATION_COUNT: self.operation_count,
+                Reg.ERROR_COUNT: self.error_count,
+                Reg.CONNECTION_COUNT: self.connection_count,
+            })
             
             print("📊 初始狀態已寫入PLC")
             
         except Exception as e:
             print(f"❌ 寫入初始狀態失敗: {e}")
     
-    def read_register(self, register_name: str) -> Optional[int]:
-        """讀取寄存器"""
-        if not self.connected or not self.client or register_name not in self.REGISTERS:
+    def read_register(self, register: Union[int, str]) -> Optional[int]:
+        """讀取寄存器 - 接受Reg地址，或名稱 (Web介面/除錯用，單次查表)"""
+        address = register if isinstance(register, int) else self.REGISTERS.get(register)
+        return None if address is None else self._rd(address)
+    
+    def write_register(self, register: Union[int, str], value: int) -> bool:
+        """寫入寄存器 - 接受Reg地址，或名稱 (Web介面/除錯用，單次查表)"""
+        address = register if isinstance(register, int) else self.REGISTERS.get(register)
+        return False if address is None else self._wr(address, value)
+    
+    def _rd(self, address: int) -> Optional[int]:
+        """以整數地址直接讀取單一寄存器 (熱路徑用，略過名稱查表)"""
+        if not self.connected or not self.client:
             return None
-        
         try:
-            address = self.REGISTERS[register_name]
-            result = self.client.read_holding_registers(address, count=1, slave=1)
-            
-            if not result.isError():
-                return result.registers[0]
-            else:
-                return None
-                
-        except Exception as e:
+            with self._io_lock:
+                result = self.client.read_holding_registers(address, count=1, slave=1)
+            return None if result.isError() else result.registers[0]
+        except Exception:
             return None
     
-    def write_register(self, register_name: str, value: int) -> bool:
-        """寫入寄存器"""
-        if not self.connected or not self.client or register_name not in self.REGISTERS:
+    def read_range(self, start: int, count: int) -> Optional[List[int]]:
+        """一次讀取start起連續count個寄存器 (讀取失敗或未連接時返回None)"""
+        if not self.connected or not self.client:
+            return None
+        try:
+            with self._io_lock:
+                result = self.client.read_holding_registers(int(start), count=count, slave=1)
+            return None if result.isError() else list(result.registers[:count])
+        except Exception:
+            return None
+    
+    def _wr(self, address: int, value: int) -> bool:
+        """以整數地址直接寫入單一寄存器 (熱路徑用，略過名稱查表)"""
+        if not self.connected or not self.client:
             return False
-        
         try:
-            address = self.REGISTERS[register_name]
-            result = self.client.write_register(address, value, slave=1)
-            
-            if not result.isError():
-                return True
-            else:
-                return False
-                
-        except Exception as e:
+            with self._io_lock:
+                result = self.client.write_register(address, int(value) & 0xFFFF, slave=1)
+            return not result.isError()
+        except Exception:
             return False
     
+    def write_registers_batch(self, values: Dict[int, int]) -> bool:
+        """批次寫入多個寄存器 {地址: 值} - 依地址排序並合併連續地址，每段只發送一次write_registers"""
+        if not self.connected or not self.client:
+            return False
+        
+        pairs = sorted((int(address), int(value) & 0xFFFF) for address, value in values.items())
+        
+        # 整批在鎖內送出，其他線程的請求不會插入各段之間
+        success = True
+        with self._io_lock:
+            for start_address, run_values in _merge_register_runs(pairs):
+                try:
+                    result = self.client.write_registers(start_address, run_values, slave=1)
+                    if result.isError():
+                        success = False
+                except Exception:
+                    success = False
+        return success
+    
     def read_confidence_threshold(self) -> float:
-        """讀取置信度閾值"""
+        """讀取置信度閾值 - 210-211一次讀取後以struct組合 (未設定或讀取失敗時為0.8)"""
         try:
-            high = self.read_register('CONFIDENCE_HIGH') or 0
-            low = self.read_register('CONFIDENCE_LOW') or 8000
-            confidence_int = (high << 16) + low
-            return confidence_int / 10000.0
+            if not self.connected or not self.client:
+                return 0.8
+            with self._io_lock:
+                rr = self.client.read_holding_registers(Reg.CONFIDENCE_HIGH, count=2, slave=1)
+            if rr.isError():
+                return 0.8
+            confidence_int, = _words_i32(rr.registers[:2])
+            return confidence_int / 10000.0 if confidence_int else 0.8
         except:
             return 0.8
     
@@ -1822,10 +2421,131 @@ class EnhancedModbusTcpClientService:
             'operation_count': self.operation_count,
             'error_count': self.error_count,
             'connection_count': self.connection_count,
-            'uptime_seconds': int(time.time() - self.start_time)
+            'uptime_seconds': (time.monotonic_ns() - self.start_time_ns) // 1_000_000_000
         }
 
 
+# Web預覽JPEG編碼參數：品質75 (libjpeg預設) + 最佳化Huffman表，非漸進式
+_PREVIEW_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 75,
+                        cv2.IMWRITE_JPEG_OPTIMIZE, 1,
+                        cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+
+
+# ==================== 可視化標籤快取 ====================
+# (文字, 字體比例, 線寬, 顏色, 背景色) → (BGR圖塊, 遮罩或None, 基線上方高度)
+_LABEL_CACHE: Dict[tuple, Tuple[np.ndarray, Optional[np.ndarray], int]] = {}
+
+
+def _label_sprite(text: str, font_scale: float, thickness: int,
+                  color: Tuple[int, int, int], bg: Optional[Tuple[int, int, int]] = None,
+                  pad: int = 0) -> Tuple[np.ndarray, Optional[np.ndarray], int]:
+    """取得預先光柵化的標籤圖塊，首次使用時以cv2.putText繪製一次後快取
+    
+    bg為None時文字背景透明 (附遮罩)；否則為含pad邊距的實心底色圖塊
+    """
+    key = (text, font_scale, thickness, color, bg, pad)
+    sprite = _LABEL_CACHE.get(key)
+    if sprite is None:
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        (w, h), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+        height = h + baseline + thickness
+        patch = np.zeros((height + 2 * pad, w + 2 * pad, 3), dtype=np.uint8)
+        if bg is not None:
+            patch[:] = bg
+            mask = None
+        else:
+            mask_img = np.zeros(patch.shape[:2], dtype=np.uint8)
+            cv2.putText(mask_img, text, (pad, pad + h), font, font_scale, 255, thickness)
+            mask = (mask_img > 0)[..., None]
+        cv2.putText(patch, text, (pad, pad + h), font, font_scale, color, thickness)
+        sprite = (patch, mask, pad + h)
+        _LABEL_CACHE[key] = sprite
+    return sprite
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _draw_markers(img, markers):
+        """依序繪製檢測標記：實心圓 + 白色外環，單次呼叫處理全部目標
+        
+        markers每列: (cx, cy, 實心半徑, 外環半徑, 外環線寬, B, G, R)
+        只掃描每個標記的外接方框，依距離平方判斷像素歸屬
+        """
+        h = img.shape[0]
+        w = img.shape[1]
+        for m in range(markers.shape[0]):
+            cx = markers[m, 0]
+            cy = markers[m, 1]
+            fill_r2 = markers[m, 2] * markers[m, 2]
+            half_t = markers[m, 4] * 0.5
+            ring_in = markers[m, 3] - half_t
+            ring_out = markers[m, 3] + half_t
+            ring_in2 = ring_in * ring_in if ring_in > 0.0 else 0.0
+            ring_out2 = ring_out * ring_out
+            b = np.uint8(markers[m, 5])
+            g = np.uint8(markers[m, 6])
+            r = np.uint8(markers[m, 7])
+            reach = int(max(markers[m, 2], ring_out)) + 1
+            y0 = max(int(cy) - reach, 0)
+            y1 = min(int(cy) + reach + 1, h)
+            x0 = max(int(cx) - reach, 0)
+            x1 = min(int(cx) + reach + 1, w)
+            for y in range(y0, y1):
+                dy = y - cy
+                for x in range(x0, x1):
+                    dx = x - cx
+                    d2 = dx * dx + dy * dy
+                    if d2 >= ring_in2 and d2 <= ring_out2:
+                        img[y, x, 0] = 255
+                        img[y, x, 1] = 255
+                        img[y, x, 2] = 255
+                    elif d2 <= fill_r2:
+                        img[y, x, 0] = b
+                        img[y, x, 1] = g
+                        img[y, x, 2] = r
+
+
+def _blit_label(image: np.ndarray, sprite: Tuple[np.ndarray, Optional[np.ndarray], int],
+                x: int, y: int):
+    """將標籤圖塊貼到image，(x, y)為文字基線起點 (同cv2.putText的org)，超出邊界部分裁切"""
+    patch, mask, ascent = sprite
+    h, w = patch.shape[:2]
+    top, left = y - ascent, x
+    y0, x0 = max(top, 0), max(left, 0)
+    y1, x1 = min(top + h, image.shape[0]), min(left + w, image.shape[1])
+    if y0 >= y1 or x0 >= x1:
+        return
+    src = patch[y0 - top:y1 - top, x0 - left:x1 - left]
+    roi = image[y0:y1, x0:x1]
+    if mask is None:
+        roi[...] = src
+    else:
+        np.copyto(roi, src, where=mask[y0 - top:y1 - top, x0 - left:x1 - left])
+
+
+def _warmup_numba_kernels():
+    """以極小合成資料呼叫全部Numba核心一次，於接受HTTP請求前完成JIT編譯/載入快取
+    
+    參數型別與實際呼叫一致 (C連續uint8影像、float32輸入緩衝、float64座標與矩陣)，
+    避免首次拍照檢測時才為新簽名編譯
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    try:
+        warmup_start = time.time()
+        _preprocess_yolo(np.zeros((4, 4, 3), dtype=np.uint8), np.empty((3, 8, 8), dtype=np.float32),
+                         2.0, 8, 8, 0, 0)
+        und_xy = np.zeros((1, 2))
+        RT = np.eye(3)
+        t = np.array([0.0, 0.0, 1.0])
+        _backproject_z0(und_xy, RT, t)
+        _backproject_z0_parallel(und_xy, RT, t)
+        _draw_markers(np.zeros((1, 1, 3), dtype=np.uint8), np.zeros((1, 8)))
+        print(f"🔥 Numba核心預熱完成，耗時: {(time.time() - warmup_start)*1000:.0f}ms")
+    except Exception as e:
+        print(f"⚠️ Numba核心預熱失敗: {e}")
+
+
 # ==================== 主控制器 ====================
 class CCD1VisionController:
     """CCD1視覺檢測主控制器 - YOLOv11版本"""
@@ -1846,6 +2566,15 @@ class CCD1VisionController:
         # 圖像緩存
         self.last_image: Optional[np.ndarray] = None
         self.last_result: Optional[YOLODetectionResult] = None
+        # 拍照鎖: 序列化拍照與檢測 (Flask路由與Modbus指令線程可能同時觸發)，
+        # 確保檢測器雙緩衝池中的幀在檢測完成前不被下一次拍照覆寫
+        self._capture_lock = threading.RLock()
+        # base64預覽快取: last_image每次更新時遞增token，編碼結果以(token, data_url)保存
+        self._last_image_token = 0
+        self._last_b64_cache: Tuple[int, Optional[str]] = (-1, None)
+        
+        # SocketIO狀態廣播: 上次已廣播的狀態快照，只推送變化欄位
+        self._last_status_snapshot: Dict[str, Any] = {}
         
         # Modbus客戶端
         self.modbus_client = EnhancedModbusTcpClientService(self.server_ip, self.server_port)
@@ -1984,26 +2713,20 @@ class CCD1VisionController:
                 print(f"⚠️ 標定數據無效，跳過世界座標轉換")
                 return
             
-            print(f"🌍 執行YOLOv11結果世界座標轉換...")
-            
             # 僅轉換DR_F座標（作為圓心處理）
             if result.dr_f_coords:
-                print(f"   轉換{len(result.dr_f_coords)}個DR_F目標座標")
+                logger.debug("執行YOLOv11結果世界座標轉換，共%d個DR_F目標", len(result.dr_f_coords))
                 try:
                     # 🔥 使用修正版的像素到世界座標轉換
                     world_coords = self.calibration_manager.transformer.pixel_to_world(result.dr_f_coords)
                     
                     if world_coords:
-                        # 將世界座標轉換為Python原生類型並存儲到結果中
-                        result.dr_f_world_coords = []
-                        for wx, wy in world_coords:
-                            # 確保轉換為Python原生float類型
-                            world_x = float(wx)
-                            world_y = float(wy)
-                            result.dr_f_world_coords.append((world_x, world_y))
+                        # pixel_to_world已以tolist()一次轉出Python原生float元組，直接存入結果
+                        result.dr_f_world_coords = world_coords
                         
-                        for i, ((px, py), (wx, wy)) in enumerate(zip(result.dr_f_coords, result.dr_f_world_coords)):
-                            print(f"   DR_F {i+1}: 像素({px:.1f}, {py:.1f}) → 世界({wx:.2f}, {wy:.2f}) mm")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            for i, ((px, py), (wx, wy)) in enumerate(zip(result.dr_f_coords, result.dr_f_world_coords)):
+                                logger.debug("DR_F %d: 像素(%.1f, %.1f) → 世界(%.2f, %.2f) mm", i + 1, px, py, wx, wy)
                         
                         print(f"✅ 世界座標轉換成功，共轉換{len(world_coords)}個DR_F目標")
                     else:
@@ -2014,12 +2737,11 @@ class CCD1VisionController:
                     print(f"   ❌ DR_F座標轉換失敗: {e}")
                     result.dr_f_world_coords = []
             else:
-                print(f"   無DR_F目標需要轉換")
+                logger.debug("無DR_F目標需要轉換")
                 result.dr_f_world_coords = []
                     
         except Exception as e:
             print(f"❌ YOLOv11世界座標轉換失敗: {e}")
-            import traceback
             print(f"詳細錯誤: {traceback.format_exc()}")
             result.dr_f_world_coords = []
     def connect_modbus(self) -> Dict[str, Any]:
@@ -2136,7 +2858,12 @@ class CCD1VisionController:
             return False
     
     def capture_image(self) -> Tuple[Optional[np.ndarray], float]:
-        """拍照"""
+        """拍照 - 持有拍照鎖，返回的影像可能位於檢測器緩衝池，下一次拍照前有效"""
+        with self._capture_lock:
+            return self._capture_frame()
+    
+    def _capture_frame(self) -> Tuple[Optional[np.ndarray], float]:
+        """拍照 (呼叫端需持有_capture_lock)"""
         print(f"📸 開始拍照程序...")
         
         if not self.camera_manager:
@@ -2191,7 +2918,12 @@ class CCD1VisionController:
             print(f"📊 圖像數據: 形狀={image_array.shape}, 類型={image_array.dtype}")
             
             if len(image_array.shape) == 2:
-                display_image = cv2.cvtColor(image_array, cv2.COLOR_GRAY2BGR)
+                # 直接轉換到檢測器的雙緩衝區，省去每幀配置BGR陣列
+                if self.yolo_detector:
+                    _, frame_buffer = self.yolo_detector.get_frame_buffer(image_array.shape + (3,))
+                    display_image = cv2.cvtColor(image_array, cv2.COLOR_GRAY2BGR, dst=frame_buffer)
+                else:
+                    display_image = cv2.cvtColor(image_array, cv2.COLOR_GRAY2BGR)
                 print(f"🔄 轉換灰度圖像為BGR格式")
             else:
                 display_image = image_array
@@ -2203,12 +2935,16 @@ class CCD1VisionController:
             capture_time = time.time() - capture_start
             print(f"❌ 拍照異常: {e}")
             print(f"❌ 異常類型: {type(e).__name__}")
-            import traceback
             print(f"詳細錯誤堆疊: {traceback.format_exc()}")
             return None, capture_time
     
     def capture_and_detect(self) -> YOLODetectionResult:
-        """拍照並進行YOLOv11檢測"""
+        """拍照並進行YOLOv11檢測 - 拍照、檢測與可視化全程持有拍照鎖"""
+        with self._capture_lock:
+            return self._capture_and_detect_locked()
+    
+    def _capture_and_detect_locked(self) -> YOLODetectionResult:
+        """拍照並進行YOLOv11檢測 (呼叫端需持有_capture_lock)"""
         total_start = time.time()
         
         try:
@@ -2253,9 +2989,26 @@ class CCD1VisionController:
             return result
     
     def _create_yolo_visualization(self, image: np.ndarray, result: YOLODetectionResult):
-        """創建YOLOv11檢測結果可視化 - 支援三種分類"""
+        """創建YOLOv11檢測結果可視化 - 支援三種分類
+        
+        直接在顯示解析度(寬≤800)的縮圖上繪製，省去整幀複製與全解析度繪圖；
+        座標、半徑、線寬與字體大小依相同比例縮放
+        """
         try:
-            vis_image = image.copy()
+            height, width = image.shape[:2]
+            scale = min(1.0, 800 / width)
+            if scale < 1.0:
+                vis_image = cv2.resize(image, (800, int(height * scale)), interpolation=cv2.INTER_AREA)
+            else:
+                vis_image = image.copy()
+            
+            def px(v):
+                return int(v * scale)
+            
+            def thick(t):
+                return max(1, int(round(t * scale)))
+            
+            font = cv2.FONT_HERSHEY_SIMPLEX
             
             # 定義顏色 (BGR格式)
             colors = {
@@ -2263,61 +3016,77 @@ class CCD1VisionController:
                 'STACK': (0, 0, 255),     # 紅色
             }
             
-            # 繪製DR_F檢測結果
+            # 繪製檢測標記 (實心圓+白色外環)：Numba可用時全部目標一次繪製，否則逐一cv2.circle
+            markers = [(px(x), px(y), px(15), px(20), thick(3)) + colors['DR_F'] for x, y in result.dr_f_coords]
+            markers += [(px(x), px(y), px(12), px(17), thick(2)) + colors['STACK'] for x, y in result.stack_coords]
+            if NUMBA_AVAILABLE:
+                if markers:
+                    _draw_markers(vis_image, np.array(markers, dtype=np.float64))
+            else:
+                for cx, cy, fill_r, ring_r, ring_t, *color in markers:
+                    cv2.circle(vis_image, (cx, cy), fill_r, tuple(color), -1)
+                    cv2.circle(vis_image, (cx, cy), ring_r, (255, 255, 255), ring_t)
+            
+            # DR_F標籤：實心底色方塊+白字，預先光柵化後直接貼上
             for i, (x, y) in enumerate(result.dr_f_coords):
-                cv2.circle(vis_image, (int(x), int(y)), 15, colors['DR_F'], -1)
-                cv2.circle(vis_image, (int(x), int(y)), 20, (255, 255, 255), 3)
-                
-                label = f"DR_F {i+1}"
-                label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
-                cv2.rectangle(vis_image, (int(x-label_size[0]//2-5), int(y-40)), 
-                             (int(x+label_size[0]//2+5), int(y-10)), colors['DR_F'], -1)
-                cv2.putText(vis_image, label, (int(x-label_size[0]//2), int(y-20)), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
-            
-            # 繪製STACK檢測結果 (新增)
+                sprite = _label_sprite(f"DR_F {i+1}", 1.0 * scale, thick(2), (255, 255, 255),
+                                       bg=colors['DR_F'], pad=px(5))
+                label_width = sprite[0].shape[1] - 2 * px(5)
+                _blit_label(vis_image, sprite, px(x) - label_width // 2, px(y - 20))
+            
+            # STACK標籤 (新增)
             for i, (x, y) in enumerate(result.stack_coords):
-                cv2.circle(vis_image, (int(x), int(y)), 12, colors['STACK'], -1)
-                cv2.circle(vis_image, (int(x), int(y)), 17, (255, 255, 255), 2)
-                
-                label = f"STACK {i+1}"
-                cv2.putText(vis_image, label, (int(x-35), int(y-25)), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, colors['STACK'], 2)
+                _blit_label(vis_image, _label_sprite(f"STACK {i+1}", 0.8 * scale, thick(2), colors['STACK']),
+                            px(x - 35), px(y - 25))
             
             # 添加檢測統計信息
             stats_text = f"YOLOv11 (Model{result.model_id_used}): F={result.dr_f_count}, S={result.stack_count}"
-            cv2.putText(vis_image, stats_text, (20, 40), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 255), 3)
+            cv2.putText(vis_image, stats_text, (px(20), px(40)), 
+                       font, 1.2 * scale, (0, 255, 255), thick(3))
             
             # 添加置信度閾值信息
             conf_text = f"Confidence >= {result.confidence_threshold:.1f}"
-            cv2.putText(vis_image, conf_text, (20, 80), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 0), 2)
+            cv2.putText(vis_image, conf_text, (px(20), px(80)), 
+                       font, 1.0 * scale, (255, 255, 0), thick(2))
             
             # 保存可視化圖像
             self.last_image = vis_image
+            self._last_image_token += 1
             
         except Exception as e:
             print(f"❌ 創建可視化失敗: {e}")
     
     def get_image_base64(self) -> Optional[str]:
-        """獲取當前圖像的base64編碼"""
+        """獲取當前圖像的base64編碼
+        
+        last_image只在拍照檢測流程中寫入並同時遞增_last_image_token，
+        token未變時直接返回上次的編碼結果，狀態輪詢不再重複resize/編碼
+        """
         if self.last_image is None:
             return None
         
+        token = self._last_image_token
+        cached_token, cached_url = self._last_b64_cache
+        if cached_token == token and cached_url is not None:
+            return cached_url
+        
         try:
             height, width = self.last_image.shape[:2]
             if width > 800:
                 scale = 800 / width
                 new_width = 800
                 new_height = int(height * scale)
-                display_image = cv2.resize(self.last_image, (new_width, new_height))
+                # 縮小用INTER_AREA (區域平均，縮圖品質佳且無雙線性的鋸齒)
+                display_image = cv2.resize(self.last_image, (new_width, new_height),
+                                           interpolation=cv2.INTER_AREA)
             else:
                 display_image = self.last_image
             
-            _, buffer = cv2.imencode('.jpg', display_image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+            _, buffer = cv2.imencode('.jpg', display_image, _PREVIEW_JPEG_PARAMS)
             image_base64 = base64.b64encode(buffer).decode('utf-8')
-            return f"data:image/jpeg;base64,{image_base64}"
+            data_url = f"data:image/jpeg;base64,{image_base64}"
+            self._last_b64_cache = (token, data_url)
+            return data_url
             
         except Exception as e:
             self.logger.error(f"圖像編碼失敗: {e}")
@@ -2328,11 +3097,12 @@ class CCD1VisionController:
         if self.yolo_detector:
             self.yolo_detector.update_confidence_threshold(threshold)
             
-            # 同步到Modbus寄存器
+            # 同步到Modbus寄存器 (寫入檢測器限制後的實際閾值)
             if self.modbus_client.connected:
-                confidence_int = int(threshold * 10000)
-                self.modbus_client.write_register('CONFIDENCE_HIGH', (confidence_int >> 16) & 0xFFFF)
-                self.modbus_client.write_register('CONFIDENCE_LOW', confidence_int & 0xFFFF)
+                confidence_int = int(self.yolo_detector.confidence_threshold * 10000)
+                conf_high, conf_low = _i32_words([confidence_int])
+                self.modbus_client.write_registers_batch({Reg.CONFIDENCE_HIGH: conf_high,
+                                                          Reg.CONFIDENCE_LOW: conf_low})
     
     def get_status(self) -> Dict[str, Any]:
         """獲取系統狀態"""
@@ -2354,6 +3124,15 @@ class CCD1VisionController:
         
         return status
     
+    def get_status_delta(self) -> Dict[str, Any]:
+        """與上次廣播的快照比較，返回有變化的頂層欄位並更新快照"""
+        status = self.get_status()
+        last = self._last_status_snapshot
+        delta = {key: value for key, value in status.items()
+                 if key not in last or last[key] != value}
+        self._last_status_snapshot = status
+        return delta
+    
     def disconnect(self):
         """斷開所有連接"""
         # 斷開相機連接
@@ -2370,7 +3149,36 @@ class CCD1VisionController:
 # ==================== Flask Web應用 ====================
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'ccd1_yolo_vision_v5'
-socketio = SocketIO(app, cors_allowed_origins="*")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """以orjson實作Flask JSON序列化 - 所有jsonify與request.json皆經由此處
+    
+    NumPy陣列/純量與非字串鍵直接在C層處理；orjson不支援的型別交由Flask預設default轉換
+    """
+    
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if ORJSON_AVAILABLE else 0
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode()
+    
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+# 固定使用threading模式: YOLO推論與pymodbus同步I/O為阻塞呼叫，eventlet/gevent協程下會卡住
+# 50ms握手循環；未指定時若環境裝有eventlet會被自動選用。長輪詢回應維持壓縮 (>1KB)
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading',
+                    http_compression=True, compression_threshold=1024)
+
+# 廣播合併窗口 (秒): 窗口內多個端點的廣播請求合併為一次送出，
+# 狀態合併為一次status_delta，其他事件每種只保留最新一筆 (有界，不隨突發累積)
+STATUS_BROADCAST_INTERVAL = 0.05
+_status_broadcast_lock = threading.Lock()
+_status_broadcast_pending = False
+_pending_events: Dict[str, Any] = {}
 
 # 全局控制器實例
 controller = None
@@ -2381,16 +3189,86 @@ def initialize_controller():
     try:
         print("🚀 正在初始化CCD1視覺控制器 (YOLOv11版本)...")
         controller = CCD1VisionController()
+        _warmup_numba_kernels()
         print("✅ CCD1視覺控制器初始化成功")
         print("🎯 所有組件已自動初始化完成")
         return True
     except Exception as e:
         print(f"❌ CCD1視覺控制器初始化失敗: {e}")
-        import traceback
         print(f"詳細錯誤: {traceback.format_exc()}")
         return False
 
 
+def _build_detection_response(result: YOLODetectionResult, image: Optional[str],
+                              modbus_connected: bool) -> Dict[str, Any]:
+    """組裝capture_and_detect回應
+    
+    結果欄位在檢測流程中已為Python原生型別 (數量以int()、座標以ndarray.tolist()產生，
+    時間為float運算，timestamp為字串)，可直接序列化 (含SocketIO使用的標準json模組)，
+    此處不再逐欄位轉型
+    """
+    return {
+        'success': result.success,
+        'dr_f_count': result.dr_f_count,
+        'stack_count': result.stack_count,  # 🔥 確保包含STACK數量
+        'total_detections': result.total_detections,
+        'dr_f_coords': result.dr_f_coords,
+        'stack_coords': result.stack_coords,  # 🔥 確保包含STACK座標
+        'dr_f_world_coords': result.dr_f_world_coords,
+        'confidence_threshold': result.confidence_threshold,
+        'capture_time': result.capture_time,
+        'processing_time': result.processing_time,
+        'total_time': result.total_time,
+        'timestamp': result.timestamp,
+        'image': image,
+        'error_message': result.error_message,
+        'world_coord_valid': bool(result.dr_f_world_coords),
+        'model_id_used': result.model_id_used,  # 🔥 確保模型ID包含在響應中
+        'modbus_write_success': modbus_connected
+    }
+
+
+def broadcast_status():
+    """排程狀態廣播 - 合併窗口結束時計算差異並推送status_delta"""
+    _schedule_broadcast()
+
+
+def queue_emit(event: str, payload: Any):
+    """排入待推送事件 - 由背景任務送出，請求線程不等待Socket寫入"""
+    _schedule_broadcast(event, payload)
+
+
+def _schedule_broadcast(event: Optional[str] = None, payload: Any = None):
+    """登記待送事件；已有待送廣播時直接返回，由該次廣播一併送出"""
+    global _status_broadcast_pending
+    with _status_broadcast_lock:
+        if event is not None:
+            _pending_events[event] = payload
+        if _status_broadcast_pending:
+            return
+        _status_broadcast_pending = True
+    socketio.start_background_task(_flush_status_broadcast)
+
+
+def _flush_status_broadcast():
+    """等待合併窗口後送出待送事件，再計算狀態差異，僅在有欄位變化時推送status_delta"""
+    global _status_broadcast_pending
+    socketio.sleep(STATUS_BROADCAST_INTERVAL)
+    with _status_broadcast_lock:
+        events = _pending_events.copy()
+        _pending_events.clear()
+        _status_broadcast_pending = False
+    try:
+        for event, payload in events.items():
+            socketio.emit(event, payload)
+        if controller:
+            delta = controller.get_status_delta()
+            if delta:
+                socketio.emit('status_delta', delta)
+    except Exception as e:
+        print(f"❌ 狀態廣播失敗: {e}")
+
+
 @app.route('/')
 def index():
     """主頁面"""
@@ -2415,7 +3293,7 @@ def switch_model():
                 
                 # 同步到Modbus寄存器
                 if controller.modbus_client and controller.modbus_client.connected:
-                    controller.modbus_client.write_register('MODEL_SELECT', current_model)
+                    controller.modbus_client.write_register(Reg.MODEL_SELECT, current_model)
                 
                 return jsonify({
                     'success': True,
@@ -2477,7 +3355,7 @@ def connect_modbus():
     
     try:
         result = controller.connect_modbus()
-        socketio.emit('status_update', controller.get_status())
+        broadcast_status()
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -2491,7 +3369,7 @@ def disconnect_modbus():
     
     try:
         result = controller.disconnect_modbus()
-        socketio.emit('status_update', controller.get_status())
+        broadcast_status()
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -2515,7 +3393,7 @@ def initialize_camera():
             'camera_ip': ip
         }
         
-        socketio.emit('status_update', controller.get_status())
+        broadcast_status()
         return jsonify(result)
         
     except Exception as e:
@@ -2560,41 +3438,11 @@ def capture_and_detect():
             except Exception as modbus_error:
                 print(f"❌ Flask API - Modbus寄存器寫入失敗: {modbus_error}")
         
-        # 確保所有數據類型都能序列化為JSON
-        def convert_to_serializable(data):
-            """轉換數據為JSON可序列化格式"""
-            if isinstance(data, (list, tuple)):
-                return [convert_to_serializable(item) for item in data]
-            elif isinstance(data, dict):
-                return {key: convert_to_serializable(value) for key, value in data.items()}
-            elif hasattr(data, 'item'):  # NumPy scalar
-                return data.item()
-            elif isinstance(data, (np.float32, np.float64)):
-                return float(data)
-            elif isinstance(data, (np.int32, np.int64)):
-                return int(data)
-            else:
-                return data
-        
-        response = {
-            'success': result.success,
-            'dr_f_count': int(result.dr_f_count),
-            'stack_count': int(result.stack_count),  # 🔥 確保包含STACK數量
-            'total_detections': int(result.total_detections),
-            'dr_f_coords': convert_to_serializable(result.dr_f_coords),
-            'stack_coords': convert_to_serializable(result.stack_coords),  # 🔥 確保包含STACK座標
-            'dr_f_world_coords': convert_to_serializable(getattr(result, 'dr_f_world_coords', [])),
-            'confidence_threshold': float(result.confidence_threshold),
-            'capture_time': float(result.capture_time),
-            'processing_time': float(result.processing_time),
-            'total_time': float(result.total_time),
-            'timestamp': str(result.timestamp),
-            'image': controller.get_image_base64(),
-            'error_message': result.error_message,
-            'world_coord_valid': len(getattr(result, 'dr_f_world_coords', [])) > 0,
-            'model_id_used': int(result.model_id_used),  # 🔥 確保模型ID包含在響應中
-            'modbus_write_success': controller.modbus_client.connected if controller.modbus_client else False
-        }
+        response = _build_detection_response(
+            result,
+            controller.get_image_base64(),
+            controller.modbus_client.connected if controller.modbus_client else False
+        )
         
         # 🔥 調試：打印響應數據
         print(f"📤 API響應數據檢查:")
@@ -2602,7 +3450,7 @@ def capture_and_detect():
         print(f"   STACK: {response['stack_count']}")
         print(f"   模型ID: {response['model_id_used']}")
         
-        socketio.emit('detection_result', response)
+        queue_emit('detection_result', response)
         return jsonify(response)
         
     except Exception as e:
@@ -2620,6 +3468,10 @@ def update_confidence():
         data = request.json
         threshold = float(data.get('threshold', 0.8))
         
+        # 先驗證範圍再修改檢測器與寄存器 (NaN比較恆為False，一併拒絕)
+        if not 0.0 <= threshold <= 1.0:
+            return jsonify({'success': False, 'error': f'置信度閾值需介於0.0-1.0: {threshold}'})
+        
         controller.update_confidence_threshold(threshold)
         
         return jsonify({
@@ -2657,7 +3509,7 @@ def load_calibration():
         extrinsic_file = data.get('extrinsic_file')
         
         result = controller.calibration_manager.load_calibration_data(intrinsic_file, extrinsic_file)
-        socketio.emit('status_update', controller.get_status())
+        broadcast_status()
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -2673,68 +3525,75 @@ def get_modbus_registers():
         registers = {}
         modbus_client = controller.modbus_client
         
+        # 兩次批次讀取 (200-211控制/參數, 240-291結果/統計)，再於本地依地址取值
+        blocks = [
+            (Reg.CONTROL_COMMAND, modbus_client.read_range(Reg.CONTROL_COMMAND, 12)),
+            (Reg.DR_F_COUNT, modbus_client.read_range(Reg.DR_F_COUNT, 52)),
+        ]
+        
+        def reg(address: int) -> Optional[int]:
+            for start, values in blocks:
+                if values is not None and start <= address < start + len(values):
+                    return values[address - start]
+            return None
+        
         # 控制寄存器
-        registers['200_控制指令'] = modbus_client.read_register('CONTROL_COMMAND')
-        registers['201_狀態寄存器'] = modbus_client.read_register('STATUS_REGISTER')
-        registers['202_模型選擇'] = modbus_client.read_register('MODEL_SELECT')  # 新增模型選擇
+        registers['200_控制指令'] = reg(Reg.CONTROL_COMMAND)
+        registers['201_狀態寄存器'] = reg(Reg.STATUS_REGISTER)
+        registers['202_模型選擇'] = reg(Reg.MODEL_SELECT)  # 新增模型選擇
         
         # 完成標誌寄存器
-        registers['203_拍照完成'] = modbus_client.read_register('CAPTURE_COMPLETE')
-        registers['204_檢測完成'] = modbus_client.read_register('DETECT_COMPLETE')
-        registers['205_操作成功'] = modbus_client.read_register('OPERATION_SUCCESS')
-        registers['206_錯誤代碼'] = modbus_client.read_register('ERROR_CODE')
-        
-        # 置信度閾值
-        conf_high = modbus_client.read_register('CONFIDENCE_HIGH') or 0
-        conf_low = modbus_client.read_register('CONFIDENCE_LOW') or 8000
-        confidence = (conf_high << 16) + conf_low
-        registers['210-211_置信度閾值'] = f"{confidence/10000.0:.2f}"
+        registers['203_拍照完成'] = reg(Reg.CAPTURE_COMPLETE)
+        registers['204_檢測完成'] = reg(Reg.DETECT_COMPLETE)
+        registers['205_操作成功'] = reg(Reg.OPERATION_SUCCESS)
+        registers['206_錯誤代碼'] = reg(Reg.ERROR_CODE)
+        
+        # 置信度閾值 (未設定或讀取失敗時為0.8)
+        confidence_high = reg(Reg.CONFIDENCE_HIGH)
+        confidence_low = reg(Reg.CONFIDENCE_LOW)
+        confidence = 0.8
+        if confidence_high is not None and confidence_low is not None:
+            confidence_int, = _words_i32([confidence_high, confidence_low])
+            if confidence_int:
+                confidence = confidence_int / 10000.0
+        registers['210-211_置信度閾值'] = f"{confidence:.2f}"
 
         # 🔥 修正檢測結果 - 正確的地址映射
-        registers['240_DR_F數量'] = modbus_client.read_register('DR_F_COUNT')
-        registers['242_STACK數量'] = modbus_client.read_register('STACK_COUNT')  # 🔥 修正：這是STACK不是總檢測
-        registers['243_總檢測數量'] = modbus_client.read_register('TOTAL_DETECTIONS')  # 🔥 修正：這才是總檢測數量
-        registers['244_檢測成功標誌'] = modbus_client.read_register('DETECTION_SUCCESS')
+        registers['240_DR_F數量'] = reg(Reg.DR_F_COUNT)
+        registers['242_STACK數量'] = reg(Reg.STACK_COUNT)  # 🔥 修正：這是STACK不是總檢測
+        registers['243_總檢測數量'] = reg(Reg.TOTAL_DETECTIONS)  # 🔥 修正：這才是總檢測數量
+        registers['244_檢測成功標誌'] = reg(Reg.DETECTION_SUCCESS)
         
         # 🔥 新增：DR_F座標寄存器 (245-254)
         for i in range(1, 6):
-            dr_f_x = modbus_client.read_register(f'DR_F_{i}_X')
-            dr_f_y = modbus_client.read_register(f'DR_F_{i}_Y')
+            dr_f_x = reg(Reg.DR_F_1_X + (i-1)*2)
+            dr_f_y = reg(Reg.DR_F_1_Y + (i-1)*2)
             if dr_f_x is not None and dr_f_y is not None and (dr_f_x != 0 or dr_f_y != 0):
                 registers[f'{245+(i-1)*2}_DR_F_{i}_X'] = dr_f_x
                 registers[f'{246+(i-1)*2}_DR_F_{i}_Y'] = dr_f_y
         
-        stack_x = modbus_client.read_register('STACK_1_X')
-        stack_y = modbus_client.read_register('STACK_1_Y')
+        stack_x = reg(Reg.STACK_1_X)
+        stack_y = reg(Reg.STACK_1_Y)
         if stack_x is not None and stack_y is not None and (stack_x != 0 or stack_y != 0):
             registers['257_STACK_1_X'] = stack_x
             registers['258_STACK_1_Y'] = stack_y
         
-        used_model_id = modbus_client.read_register('MODEL_ID_USED')
+        used_model_id = reg(Reg.MODEL_ID_USED)
         if used_model_id is not None:
             registers['259_檢測使用模型ID'] = used_model_id
         
-        # 世界座標寄存器 (260-279)
-        world_coord_valid = modbus_client.read_register('WORLD_COORD_VALID')
+        # 世界座標寄存器 (260-280)
+        world_coord_valid = reg(Reg.WORLD_COORD_VALID)
         registers['260_世界座標有效'] = world_coord_valid
         
         if world_coord_valid:
             for i in range(1, 6):
-                x_high = modbus_client.read_register(f'DR_F_{i}_WORLD_X_HIGH') or 0
-                x_low = modbus_client.read_register(f'DR_F_{i}_WORLD_X_LOW') or 0
-                y_high = modbus_client.read_register(f'DR_F_{i}_WORLD_Y_HIGH') or 0
-                y_low = modbus_client.read_register(f'DR_F_{i}_WORLD_Y_LOW') or 0
+                base = Reg.DR_F_1_WORLD_X_HIGH + (i-1)*4
+                words = [reg(base + k) or 0 for k in range(4)]
                 
-                if x_high != 0 or x_low != 0 or y_high != 0 or y_low != 0:
-                    # 組合32位座標值並轉換為實際座標
-                    world_x_int = (x_high << 16) + x_low
-                    world_y_int = (y_high << 16) + y_low
-                    
-                    # 處理負數（補碼轉換）
-                    if world_x_int >= 2**31:
-                        world_x_int -= 2**32
-                    if world_y_int >= 2**31:
-                        world_y_int -= 2**32
+                if any(words):
+                    # 組合32位座標值 (補碼) 並轉換為實際座標
+                    world_x_int, world_y_int = _words_i32(words)
                     
                     world_x_mm = world_x_int / 100.0
                     world_y_mm = world_y_int / 100.0
@@ -2743,16 +3602,16 @@ def get_modbus_registers():
                     registers[f'{263+(i-1)*4}_DR_F_{i}_世界Y'] = f"{world_y_mm:.2f}mm"
         
         # 統計資訊
-        registers['281_拍照耗時ms'] = modbus_client.read_register('LAST_CAPTURE_TIME')
-        registers['282_處理耗時ms'] = modbus_client.read_register('LAST_PROCESS_TIME')
-        registers['283_總耗時ms'] = modbus_client.read_register('LAST_TOTAL_TIME')
-        registers['284_操作計數'] = modbus_client.read_register('OPERATION_COUNT')
-        registers['285_錯誤計數'] = modbus_client.read_register('ERROR_COUNT')
-        registers['287_模型切換次數'] = modbus_client.read_register('MODEL_SWITCH_COUNT')  # 新增
+        registers['281_拍照耗時ms'] = reg(Reg.LAST_CAPTURE_TIME)
+        registers['282_處理耗時ms'] = reg(Reg.LAST_PROCESS_TIME)
+        registers['283_總耗時ms'] = reg(Reg.LAST_TOTAL_TIME)
+        registers['284_操作計數'] = reg(Reg.OPERATION_COUNT)
+        registers['285_錯誤計數'] = reg(Reg.ERROR_COUNT)
+        registers['287_模型切換次數'] = reg(Reg.MODEL_SWITCH_COUNT)  # 新增
         
         # 版本資訊
-        version_major = modbus_client.read_register('VERSION_MAJOR')
-        version_minor = modbus_client.read_register('VERSION_MINOR')
+        version_major = reg(Reg.VERSION_MAJOR)
+        version_minor = reg(Reg.VERSION_MINOR)
         if version_major is not None and version_minor is not None:
             registers['290-291_軟體版本'] = f"v{version_major}.{version_minor}"
         
@@ -2774,7 +3633,7 @@ def disconnect():
     
     try:
         controller.disconnect()
-        socketio.emit('status_update', controller.get_status())
+        broadcast_status()
         return jsonify({'success': True, 'message': '所有連接已斷開'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -2784,6 +3643,7 @@ def disconnect():
 def handle_connect(auth=None):
     """客戶端連接"""
     if controller:
+        # 新客戶端先取得完整狀態作為基準，之後接收status_delta
         emit('status_update', controller.get_status())
 
 
@@ -928,14 +928,9 @@ class EnhancedModbusTcpClientService:
     
     def _coord_to_registers(self, coord: float) -> Tuple[int, int]:
         """座標值轉換為寄存器值 (×100精度)"""
-        coord_int = int(coord * 100)
-        # 處理負數
-        if coord_int < 0:
-            coord_int = coord_int + 2**32
-        
-        high = (coord_int >> 16) & 0xFFFF
-        low = coord_int & 0xFFFF
-        return high, low
+        # 遮罩即得補碼表示，負數無需分支
+        coord_uint32 = int(coord * 100) & 0xFFFFFFFF
+        return coord_uint32 >> 16, coord_uint32 & 0xFFFF
     
     def _update_initialization_status(self):
         """更新初始化狀態"""